@@ -0,0 +1,29 @@
+"""
+构建时间 - 支持 SOURCE_DATE_EPOCH 和可复现构建
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+def get_build_time(reproducible: bool = False) -> Optional[datetime]:
+    """获取写入文档的构建时间
+
+    设置了 SOURCE_DATE_EPOCH 时使用该时间（UTC）；否则可复现模式下返回None
+    （文档中不输出时间），普通模式下返回当前时间。
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        try:
+            return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            print(f"警告: 无效的 SOURCE_DATE_EPOCH: {epoch}")
+
+    if reproducible:
+        return None
+    return datetime.now()
+
+def format_build_time(reproducible: bool = False, fmt: str = '%Y-%m-%d %H:%M:%S') -> Optional[str]:
+    """获取格式化的构建时间，没有构建时间时返回None"""
+    build_time = get_build_time(reproducible)
+    return build_time.strftime(fmt) if build_time else None
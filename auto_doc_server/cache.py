@@ -0,0 +1,203 @@
+"""
+解析结果缓存 - 按文件内容哈希将ModuleInfo持久化到磁盘
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from .parser import ModuleInfo
+
+# 缓存格式版本，解析结果的数据结构变化时需要递增
+CACHE_FORMAT = 5
+
+# load 对预扫描跳过的文件（内容中没有标记）返回的结果，这类文件不保存解析结果
+PREFILTERED = object()
+
+class ParseCache:
+    """基于内容哈希的解析结果缓存
+
+    每个文件的缓存键由文件路径、文件内容哈希、解析器选项和工具版本组成。
+    为避免每次都读取文件计算哈希，索引中记录了文件的 mtime 和大小，
+    两者均未变化时直接复用上次计算的内容哈希。
+
+    索引中还记录了每个文件内容的git blob ID和生成时的HEAD提交，
+    供 --changed-since 模式确认上次的记录与基准提交中的文件一致。
+    """
+
+    def __init__(self, cache_dir: Path, options: Optional[Dict[str, Any]] = None):
+        from . import __version__
+
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / "modules"
+        self.index_file = self.cache_dir / "index.json"
+        self.options_key = json.dumps(
+            {'version': __version__, 'format': CACHE_FORMAT, 'options': options or {}},
+            sort_keys=True
+        )
+
+        self.hits = 0
+        self.misses = 0
+
+        # 上次运行的索引: 文件路径 -> {mtime_ns, size, hash, blob, key[, prefiltered]}
+        self._index, self.previous_git_head = self._load_index()
+        # 本次运行时项目所在的git提交（由调用方设置，保存在索引中）
+        self.git_head: Optional[str] = None
+        # 本次运行涉及的文件，保存时只保留这些条目
+        self._current: Dict[str, Dict[str, Any]] = {}
+
+    def _load_index(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        """加载缓存索引，返回 (文件记录, 生成时的git提交)"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('options_key') == self.options_key:
+                return index.get('files', {}), index.get('git_head')
+        except (OSError, ValueError):
+            pass
+        return {}, None
+
+    def _entry_path(self, key: str) -> Path:
+        """缓存条目文件路径"""
+        return self.entries_dir / key[:2] / f"{key}.pickle"
+
+    def _make_record(self, file_path: Path) -> Dict[str, Any]:
+        """计算文件的缓存记录（优先使用 mtime+size 快速判断）"""
+        path_key = os.path.abspath(file_path)
+        stat = os.stat(path_key)
+
+        previous = self._index.get(path_key)
+        if previous and previous['mtime_ns'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+            return previous
+
+        with open(path_key, 'rb') as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        # 与 git hash-object 相同的blob ID
+        blob = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+        key = hashlib.sha256(
+            f"{self.options_key}\0{path_key}\0{content_hash}".encode('utf-8')
+        ).hexdigest()
+
+        return {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': content_hash,
+            'blob': blob,
+            'key': key
+        }
+
+    def load(self, file_path: Path) -> Optional[ModuleInfo]:
+        """读取缓存的解析结果，未命中时返回None，上次预扫描跳过且内容未变时返回 PREFILTERED"""
+        try:
+            record = self._make_record(file_path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self._current[os.path.abspath(file_path)] = record
+        if record.get('prefiltered'):
+            self.hits += 1
+            return PREFILTERED
+
+        module_info = self._read_entry(record['key'])
+        if module_info is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return module_info
+
+    def load_recorded(self, file_path: Path, blob: str) -> Optional[ModuleInfo]:
+        """按上次运行记录的缓存键读取，不检查文件状态
+
+        只用于git报告与基准提交相比未改动的文件：blob 为该文件在基准提交中的blob ID，
+        上次记录的内容与之相同时才使用记录，否则（或未命中时）返回None。
+        """
+        path_key = os.path.abspath(file_path)
+        record = self._index.get(path_key)
+        if record is None or record.get('blob') != blob:
+            return None
+
+        module_info = PREFILTERED if record.get('prefiltered') else self._read_entry(record['key'])
+        if module_info is None:
+            return None
+
+        self._current[path_key] = record
+        self.hits += 1
+        return module_info
+
+    def previous_files(self) -> List[str]:
+        """上次运行时涉及的全部文件（绝对路径）"""
+        return list(self._index)
+
+    def _read_entry(self, key: str) -> Optional[ModuleInfo]:
+        """读取缓存条目，不存在或损坏时返回None"""
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def store(self, file_path: Path, module_info: ModuleInfo) -> None:
+        """写入解析结果（需先调用load计算缓存记录）"""
+        record = self._current.get(os.path.abspath(file_path))
+        if record is None:
+            return
+
+        entry_path = self._entry_path(record['key'])
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(module_info, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"警告: 无法写入解析缓存 {entry_path}: {e}")
+
+    def store_prefiltered(self, file_path: Path) -> None:
+        """记录文件被预扫描跳过（需先调用load计算缓存记录），内容不变时下次直接命中"""
+        record = self._current.get(os.path.abspath(file_path))
+        if record is not None:
+            record['prefiltered'] = True
+
+    def forget(self, file_path: Path) -> None:
+        """从索引中移除已删除的文件"""
+        self._current.pop(os.path.abspath(file_path), None)
+
+    def save(self) -> None:
+        """保存索引并清理不再引用的缓存条目"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'options_key': self.options_key, 'git_head': self.git_head, 'files': self._current}, f)
+            os.replace(tmp_path, self.index_file)
+        except OSError as e:
+            print(f"警告: 无法保存解析缓存索引 {self.index_file}: {e}")
+            return
+
+        self._prune()
+
+    def _prune(self) -> None:
+        """删除当前索引未引用的缓存条目"""
+        live_keys = {record['key'] for record in self._current.values()}
+        if not self.entries_dir.exists():
+            return
+
+        for bucket in os.scandir(self.entries_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith('.pickle') and entry.name[:-len('.pickle')] in live_keys:
+                    continue
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存命中统计"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,120 @@
+"""
+Git变更检测 - 列出相对于指定提交发生变化的文件
+"""
+
+import os
+import subprocess
+from typing import Dict, Iterable, List, Set, Tuple
+
+class GitChangesError(RuntimeError):
+    """无法通过git获取变更文件"""
+
+def _run_git(cwd: str, args: List[str]) -> str:
+    """执行git命令并返回标准输出"""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding='utf-8'
+        )
+    except FileNotFoundError:
+        raise GitChangesError("未找到git命令")
+    except subprocess.CalledProcessError as e:
+        raise GitChangesError(e.stderr.strip() or str(e))
+    return result.stdout
+
+def git_resolve(project_path: str, ref: str) -> str:
+    """将提交、分支或标签解析为提交SHA"""
+    return _run_git(os.path.abspath(project_path), ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"]).strip()
+
+def _project_relative(project_path: str) -> Tuple[str, str]:
+    """(项目绝对路径, 项目相对于仓库根目录的路径)"""
+    cwd = os.path.abspath(project_path)
+    toplevel = _run_git(cwd, ["rev-parse", "--show-toplevel"]).strip()
+    prefix = os.path.relpath(os.path.realpath(cwd), os.path.realpath(toplevel)).replace(os.sep, '/')
+    return cwd, prefix
+
+def _to_project_path(cwd: str, prefix: str, path: str, suffix: str) -> str:
+    """将相对于仓库根目录的路径转换为项目路径下的绝对路径，不在项目目录下或后缀不符时返回空字符串"""
+    if not path.endswith(suffix):
+        return ""
+    if prefix != '.':
+        if not path.startswith(prefix + '/'):
+            return ""
+        path = path[len(prefix) + 1:]
+    return os.path.normpath(os.path.join(cwd, path))
+
+def git_tree_blobs(project_path: str, ref: str, suffix: str = ".py") -> Dict[str, str]:
+    """获取 ref 中项目目录下文件的blob ID
+
+    Returns:
+        文件绝对路径 -> blob ID（与 git hash-object 的结果相同）
+    """
+    cwd, prefix = _project_relative(project_path)
+    blobs: Dict[str, str] = {}
+    # -z 输出: 模式 类型 blob\t路径\0
+    for entry in _run_git(cwd, ["ls-tree", "-r", "-z", "--full-tree", ref]).split('\0'):
+        if not entry:
+            continue
+        info, _, path = entry.partition('\t')
+        fields = info.split()
+        if len(fields) != 3 or fields[1] != 'blob':
+            continue
+        path = _to_project_path(cwd, prefix, path, suffix)
+        if path:
+            blobs[path] = fields[2]
+    return blobs
+
+def git_changed_files(project_path: str, ref: str, suffix: str = ".py") -> Tuple[Set[str], Set[str]]:
+    """获取工作区相对于 ref 变化的文件
+
+    包括已提交、未提交和未跟踪的改动。重命名视为删除旧路径并新增新路径。
+
+    Args:
+        project_path: 项目路径（需位于git仓库内）
+        ref: 比较的基准提交、分支或标签
+        suffix: 只返回该后缀的文件
+
+    Returns:
+        (新增或修改的文件绝对路径集合, 已删除的文件绝对路径集合)
+    """
+    cwd, prefix = _project_relative(project_path)
+
+    changed: Set[str] = set()
+    deleted: Set[str] = set()
+
+    # -z 输出: 状态\0路径\0，重命名和复制为 状态\0旧路径\0新路径\0
+    fields = _run_git(cwd, ["diff", "--name-status", "-z", "-M", ref, "--"]).split('\0')
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        if status[0] in 'RC':
+            old_path, new_path = fields[i + 1], fields[i + 2]
+            if status[0] == 'R':
+                deleted.add(old_path)
+            changed.add(new_path)
+            i += 3
+        else:
+            path = fields[i + 1]
+            if status[0] == 'D':
+                deleted.add(path)
+            else:
+                changed.add(path)
+            i += 2
+
+    untracked = _run_git(cwd, ["ls-files", "--others", "--exclude-standard", "-z", "--full-name"])
+    changed.update(path for path in untracked.split('\0') if path)
+
+    # git输出的路径相对于仓库根目录，只保留项目目录下的文件并转换为项目路径下的绝对路径
+    def absolute(paths: Iterable[str]) -> Set[str]:
+        result = set()
+        for path in paths:
+            path = _to_project_path(cwd, prefix, path, suffix)
+            if path:
+                result.add(path)
+        return result
+
+    return absolute(changed), absolute(deleted)
@@ -21,7 +21,13 @@ def cli():
 @click.option('--exclude', multiple=True, help='排除的文件模式')
 @click.option('--enable-comment-markers', is_flag=True, default=True, help='启用注释标记功能')
 @click.option('--disable-comment-markers', is_flag=True, help='禁用注释标记功能')
-def generate(project_path, output, config, include_all, exclude, enable_comment_markers, disable_comment_markers):
+@click.option('--jobs', '-j', type=int, default=None, help='并行解析和渲染的进程数（0表示使用全部CPU核心）')
+@click.option('--no-cache', is_flag=True, help='禁用解析结果缓存')
+@click.option('--changed-since', metavar='REF', help='只重新解析相对于指定git提交变化的文件')
+@click.option('--reproducible', is_flag=True, default=None,
+              help='可复现模式：不输出当前时间和运行环境信息（遵循 SOURCE_DATE_EPOCH）')
+def generate(project_path, output, config, include_all, exclude, enable_comment_markers, disable_comment_markers, jobs, no_cache,
+             changed_since, reproducible):
     """生成文档"""
     try:
         # 处理注释标记选项
@@ -34,9 +40,12 @@ def generate(project_path, output, config, include_all, exclude, enable_comment_
             config_path=config,
             include_all=include_all,
             exclude_patterns=list(exclude),
-            enable_comment_markers=enable_comment_markers
+            enable_comment_markers=enable_comment_markers,
+            jobs=jobs,
+            use_cache=False if no_cache else None,
+            reproducible=reproducible
         )
-        generator.generate()
+        generator.generate(changed_since=changed_since)
         click.echo("✅ 文档生成完成!")
     except Exception as e:
         click.echo(f"❌ 生成失败: {e}", err=True)
@@ -48,7 +57,10 @@ def generate(project_path, output, config, include_all, exclude, enable_comment_
 @click.option('--config', '-c', help='配置文件路径')
 @click.option('--enable-comment-markers', is_flag=True, default=True, help='启用注释标记功能')
 @click.option('--disable-comment-markers', is_flag=True, help='禁用注释标记功能')
-def watch(project_path, output, config, enable_comment_markers, disable_comment_markers):
+@click.option('--livereload-port', type=int, help='启动实时刷新服务器（SSE），每次增量生成后推送变化的页面')
+@click.option('--livereload-host', default='localhost', help='实时刷新服务器地址')
+def watch(project_path, output, config, enable_comment_markers, disable_comment_markers,
+          livereload_port, livereload_host):
     """监听文件变化并自动重新生成"""
     try:
         # 处理注释标记选项
@@ -61,7 +73,7 @@ def watch(project_path, output, config, enable_comment_markers, disable_comment_
             config_path=config,
             enable_comment_markers=enable_comment_markers
         )
-        generator.watch_and_generate()
+        generator.watch_and_generate(livereload_port=livereload_port, livereload_host=livereload_host)
     except KeyboardInterrupt:
         click.echo("\n👋 再见!")
     except Exception as e:
@@ -71,8 +83,45 @@ def watch(project_path, output, config, enable_comment_markers, disable_comment_
 @cli.command()
 @click.option('--port', default=3000, help='服务器端口')
 @click.option('--host', default='localhost', help='服务器地址')
-def serve(port, host):
+@click.option('--builtin', is_flag=True, help='使用内置服务器直接渲染生成的Markdown（不需要Node.js）')
+@click.option('--docs', 'docs_path', default='./docs', type=click.Path(), help='内置服务器的文档目录（generate的输出目录）')
+@click.option('--cache-size', default=64, type=int, help='内置服务器渲染缓存的大小上限（MB）')
+@click.option('--lazy', 'lazy_path', type=click.Path(exists=True), help='按需生成模式：直接为该项目提供文档，页面在首次访问时生成（使用内置服务器）')
+@click.option('--config', '-c', type=click.Path(exists=True), help='按需生成模式使用的配置文件路径')
+@click.option('--livereload', 'livereload_url', help='内置服务器页面连接的实时刷新地址（watch --livereload-port 启动的服务器，例如 http://localhost:35729）')
+@click.option('--verbose', '-v', is_flag=True, help='内置服务器输出请求日志')
+def serve(port, host, builtin, docs_path, cache_size, lazy_path, config, livereload_url, verbose):
     """启动Web服务器"""
+    if lazy_path:
+        from .lazy import LazyDocsServer
+        
+        try:
+            generator = AutoDocGenerator(project_path=lazy_path, config_path=config, use_cache=False)
+            LazyDocsServer(generator, host=host, port=port,
+                           cache_bytes=cache_size * 1024 * 1024, verbose=verbose).serve_forever()
+        except KeyboardInterrupt:
+            click.echo("\n👋 再见!")
+        except OSError as e:
+            click.echo(f"❌ 启动服务器失败: {e}", err=True)
+            sys.exit(1)
+        return
+    
+    if builtin:
+        from .server import DocsServer
+        
+        if not Path(docs_path).is_dir():
+            click.echo(f"❌ 文档目录不存在: {docs_path}，请先运行 generate", err=True)
+            sys.exit(1)
+        try:
+            DocsServer(docs_path, host=host, port=port, cache_bytes=cache_size * 1024 * 1024,
+                       verbose=verbose, livereload_url=livereload_url).serve_forever()
+        except KeyboardInterrupt:
+            click.echo("\n👋 再见!")
+        except OSError as e:
+            click.echo(f"❌ 启动服务器失败: {e}", err=True)
+            sys.exit(1)
+        return
+    
     try:
         import subprocess
         import os
@@ -102,6 +151,50 @@ def serve(port, host):
         click.echo(f"❌ 启动服务器失败: {e}", err=True)
         sys.exit(1)
 
+@cli.command()
+@click.argument('project_path', type=click.Path(exists=True))
+@click.option('--output', '-o', default='./docs', help='输出目录')
+@click.option('--config', '-c', help='配置文件路径')
+@click.option('--include-all', is_flag=True, help='包含所有函数和类')
+@click.option('--jobs', '-j', type=int, default=None, help='并行解析和渲染的进程数（0表示使用全部CPU核心）')
+@click.option('--host', default='127.0.0.1', help='控制接口地址')
+@click.option('--port', default=7878, type=int, help='控制接口端口（0表示自动选择）')
+@click.option('--verbose', '-v', is_flag=True, help='输出请求日志')
+def daemon(project_path, output, config, include_all, jobs, host, port, verbose):
+    """常驻进程：保持解析结果和模板，通过本地HTTP接口重新生成文档"""
+    from .daemon import DocDaemon
+    
+    try:
+        generator = AutoDocGenerator(
+            project_path=project_path,
+            output_path=output,
+            config_path=config,
+            include_all=include_all,
+            jobs=jobs
+        )
+        storm_threshold = int((generator.config.get('watch') or {}).get('storm_threshold', 500))
+        DocDaemon(generator, host=host, port=port, storm_threshold=storm_threshold,
+                  verbose=verbose).serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\n👋 再见!")
+    except Exception as e:
+        click.echo(f"❌ 守护进程失败: {e}", err=True)
+        sys.exit(1)
+
+@cli.command('compile-templates')
+@click.option('--output', '-o', default='./compiled_templates', help='预编译模板输出目录')
+def compile_templates_command(output):
+    """预编译文档模板（在配置文件中通过 precompiled_templates 使用）"""
+    try:
+        from .template_cache import compile_templates
+        
+        template_dir = Path(__file__).parent / "templates"
+        count = compile_templates(template_dir, output)
+        click.echo(f"✅ 已预编译 {count} 个模板: {output}")
+    except Exception as e:
+        click.echo(f"❌ 预编译模板失败: {e}", err=True)
+        sys.exit(1)
+
 @cli.command()
 def init():
     """初始化项目配置"""
@@ -109,23 +202,40 @@ def init():
 project_name: "My Project"
 output_path: "./docs"
 include_all: false
+jobs: 1  # 并行解析和渲染的进程数，0表示使用全部CPU核心
+cache: true  # 缓存解析结果（保存在输出目录的 .autodoc-cache 中）
+reproducible: false  # 可复现模式：相同输入生成完全一致的输出
+# precompiled_templates: "./compiled_templates"  # compile-templates 生成的预编译模板目录
+doc_ir: true  # 同时输出结构化中间表示 doc-ir.ndjson（每个模块一行JSON）
+# 排除规则使用glob语义（与.gitignore相同）：不含"/"的规则匹配任意层级的名称，
+# 结尾的"/"表示只匹配目录，"**"匹配任意层级目录，"!"开头表示重新包含
 exclude_patterns:
-  - "__pycache__"
-  - "*.pyc"
-  - ".git"
-  - "node_modules"
-  - "venv"
-  - ".env"
+  - "__pycache__/"
+  - ".git/"
+  - "node_modules/"
+  - "venv/"
+  - ".env/"
+use_gitignore: true  # 遵循项目中的 .gitignore
+prune_default_dirs: true  # 默认跳过 node_modules、.venv、site-packages 等目录
+
+watch:
+  quiet_period: 0.2  # 文件事件停止多久（秒）后开始生成
+  storm_threshold: 500  # 一批变化的文件超过该数量时执行完整重建
+  max_delay: 5.0  # 事件持续不断时最多等待多久（秒）
 
 web:
   port: 3000
   host: "localhost"
   theme: "default"
+  sidebar: "inline"  # split: VitePress侧边栏按包拆分为单独的JSON文件（模块很多时使用）
 
 markdown:
   template: "default"
-  include_source: true
-  include_toc: true
+  include_source: true  # 输出源代码（关闭后不会读取源代码）
+  include_toc: true  # 模块页面顶部输出目录
+  source_mode: "full"  # dedupe: 类源代码只输出一次，方法链接到其中的行范围
+  max_source_lines: 0  # 单个函数或类最多输出的源代码行数，0表示不限制
+  source_overflow: "truncate"  # 超出时 truncate 截断，collapse 折叠显示完整源代码
 """
     
     config_file = Path("config.yaml")
@@ -0,0 +1,354 @@
+"""
+文档守护进程 - 常驻内存，通过本地HTTP接口接收重新生成请求
+
+解析结果、编译后的模板和缓存在请求之间保持，编辑器插件和提交钩子不必每次
+启动新进程、重新导入和完整解析。并发请求合并为同一次生成（single-flight），
+同一时间只有一次生成在进行。
+
+接口（JSON）:
+    GET  /status       当前状态
+    POST /regenerate   {"paths": [...]} 重新生成指定文件，不指定时完整重新生成
+    POST /flush        等待进行中的生成结束，保存解析缓存索引和生成文件清单
+    POST /shutdown     保存状态并退出
+
+POST 请求必须使用 Content-Type: application/json，Host 和 Origin（如有）必须是守护进程
+自己的地址：浏览器中其他网站的表单或脚本无法发出这样的请求（DNS重绑定也无法通过Host检查）。
+"""
+
+import ipaddress
+import json
+import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from .generator import AutoDocGenerator
+from .livereload import page_routes
+from .watcher import ChangeBatch
+
+# 输出目录中记录守护进程地址的文件（供客户端查找）
+STATE_FILE = ".autodoc-daemon.json"
+
+# 请求体大小上限
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# 监听本机回环地址时，Host 头中可以使用的名称
+LOOPBACK_NAMES = ("localhost", "127.0.0.1", "::1")
+
+class _Build:
+    """一次待执行的生成，合并了多个请求的文件"""
+
+    def __init__(self):
+        self.paths: Dict[str, None] = {}
+        self.full = False
+        self.requests = 0
+        self.done = threading.Event()
+        self.result: Dict[str, Any] = {}
+
+class _DaemonHTTPServer(ThreadingHTTPServer):
+    """每个连接一个线程的HTTP服务器"""
+    daemon_threads = True
+
+class DocDaemon:
+    """文档守护进程
+
+    Args:
+        generator: 文档生成器，启动时完整生成一次，之后保持其内存中的解析状态
+        host: 监听地址（默认只接受本机连接）
+        port: 监听端口，0表示自动选择
+        storm_threshold: 一次请求的文件超过该数量时改为完整重建
+    """
+
+    def __init__(self, generator: AutoDocGenerator, host: str = "127.0.0.1", port: int = 7878,
+                 storm_threshold: int = 500, verbose: bool = False):
+        self.generator = generator
+        self.host = host
+        self.port = port
+        self.storm_threshold = storm_threshold
+        self.verbose = verbose
+
+        self._lock = threading.Condition()
+        self._next: Optional[_Build] = None
+        self._running: Optional[_Build] = None
+        self._closed = False
+
+        self.started_at = time.time()
+        self.builds = 0
+        self.requests = 0
+        self.last_build: Optional[Dict[str, Any]] = None
+
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self._builder: Optional[threading.Thread] = None
+
+    @property
+    def state_file(self):
+        return self.generator.output_path / STATE_FILE
+
+    def allowed_hosts(self) -> Set[str]:
+        """请求的 Host 头可以使用的值（守护进程自己的地址）"""
+        names = {self.host}
+        try:
+            if ipaddress.ip_address(self.host).is_loopback:
+                names.update(LOOPBACK_NAMES)
+        except ValueError:
+            if self.host == "localhost":
+                names.update(LOOPBACK_NAMES)
+
+        hosts = set()
+        for name in names:
+            name = f"[{name}]" if ':' in name else name
+            hosts.add(f"{name}:{self.port}".lower())
+            if self.port == 80:
+                hosts.add(name.lower())
+        return hosts
+
+    def submit(self, paths: Optional[List[str]] = None) -> Dict[str, Any]:
+        """提交重新生成请求并等待完成
+
+        生成进行期间到达的请求合并到下一次生成中，等待该次生成完成后返回同一个结果。
+        paths 为None时完整重新生成。
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("守护进程正在退出")
+            if self._next is None:
+                self._next = _Build()
+            build = self._next
+            if paths is None:
+                build.full = True
+            else:
+                for path in paths:
+                    build.paths[os.path.abspath(path)] = None
+            build.requests += 1
+            self.requests += 1
+            self._lock.notify_all()
+
+        build.done.wait()
+        result = dict(build.result)
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    def flush(self) -> Dict[str, Any]:
+        """等待所有已提交的生成结束，然后保存解析缓存索引和生成文件清单"""
+        with self._lock:
+            while self._next is not None or self._running is not None:
+                self._lock.wait()
+            self.generator.flush()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """当前状态（不等待进行中的生成）"""
+        generator = self.generator
+        with self._lock:
+            pending = len(self._next.paths) if self._next else 0
+            building = self._running is not None
+        return {
+            'pid': os.getpid(),
+            'project': str(generator.project_path.resolve()),
+            'output': str(generator.output_path.resolve()),
+            'files': len(generator._files),
+            'modules': len(generator._modules),
+            'building': building,
+            'pending': pending,
+            'builds': self.builds,
+            'requests': self.requests,
+            'last_build': self.last_build,
+            'uptime': round(time.time() - self.started_at, 1),
+        }
+
+    def _run_builds(self) -> None:
+        """生成线程：每次取出所有等待中的请求执行一次生成"""
+        while True:
+            with self._lock:
+                while self._next is None and not self._closed:
+                    self._lock.wait()
+                if self._next is None:
+                    return
+                build, self._next = self._next, None
+                self._running = build
+
+            start = time.perf_counter()
+            try:
+                batch = ChangeBatch(paths=list(build.paths), full=build.full,
+                                    events=build.requests, last_event_time=time.time())
+                # 请求中明确指定的文件总是重新生成，不按文件状态跳过
+                mode, changed = self.generator.apply_changes(batch, storm_threshold=self.storm_threshold,
+                                                             force=True)
+                build.result = {
+                    'ok': True,
+                    'mode': mode,
+                    'changed': changed,
+                    'pages': page_routes(changed),
+                }
+            except Exception as e:
+                build.result = {'ok': False, 'error': str(e)}
+
+            build.result['requests'] = build.requests
+            build.result['build_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            with self._lock:
+                self.builds += 1
+                self.last_build = {
+                    'mode': build.result.get('mode'),
+                    'files': len(build.paths),
+                    'requests': build.requests,
+                    'build_ms': build.result['build_ms'],
+                    'finished_at': time.time(),
+                }
+                self._running = None
+                self._lock.notify_all()
+            build.done.set()
+
+    def make_handler(self) -> type:
+        """创建绑定到本守护进程的请求处理类"""
+        daemon = self
+
+        class DaemonRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if not self._check_origin():
+                    return
+                if urlsplit(self.path).path == "/status":
+                    self._send_json(HTTPStatus.OK, daemon.status())
+                else:
+                    self._send_json(HTTPStatus.NOT_FOUND, {'ok': False, 'error': "未知接口"})
+
+            def do_POST(self):
+                if not self._check_origin():
+                    return
+                if self.headers.get_content_type() != "application/json":
+                    self._reject(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type 必须是 application/json")
+                    return
+
+                path = urlsplit(self.path).path
+                try:
+                    body = self._read_json()
+                except ValueError as e:
+                    self._send_json(HTTPStatus.BAD_REQUEST, {'ok': False, 'error': str(e)})
+                    return
+
+                if path == "/regenerate":
+                    paths = body.get('paths')
+                    if paths is not None:
+                        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+                            self._send_json(HTTPStatus.BAD_REQUEST, {'ok': False, 'error': "paths 必须是字符串列表"})
+                            return
+                        # 相对路径相对于请求中的 cwd（默认为项目目录）
+                        base = str(body.get('cwd') or daemon.generator.project_path)
+                        paths = [os.path.join(base, p) for p in paths]
+                    try:
+                        result = daemon.submit(paths)
+                    except RuntimeError as e:
+                        self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'ok': False, 'error': str(e)})
+                        return
+                    status = HTTPStatus.OK if result.get('ok') else HTTPStatus.INTERNAL_SERVER_ERROR
+                    self._send_json(status, result)
+                elif path == "/flush":
+                    self._send_json(HTTPStatus.OK, daemon.flush())
+                elif path == "/shutdown":
+                    self._send_json(HTTPStatus.OK, {'ok': True})
+                    threading.Thread(target=daemon.shutdown, daemon=True).start()
+                else:
+                    self._send_json(HTTPStatus.NOT_FOUND, {'ok': False, 'error': "未知接口"})
+
+            def _check_origin(self) -> bool:
+                """Host 和 Origin 必须是守护进程自己的地址，否则拒绝请求"""
+                allowed = daemon.allowed_hosts()
+                host = (self.headers.get("Host") or "").lower()
+                if host not in allowed:
+                    self._reject(HTTPStatus.FORBIDDEN, f"不允许的 Host: {host}")
+                    return False
+                origin = self.headers.get("Origin")
+                if origin is not None and origin.lower() not in {f"http://{h}" for h in allowed}:
+                    self._reject(HTTPStatus.FORBIDDEN, f"不允许的 Origin: {origin}")
+                    return False
+                return True
+
+            def _reject(self, status: HTTPStatus, error: str) -> None:
+                # 请求体没有读取，不能继续复用连接
+                self.close_connection = True
+                self._send_json(status, {'ok': False, 'error': error})
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_REQUEST_BYTES:
+                    raise ValueError("请求体过大")
+                if not length:
+                    return {}
+                body = json.loads(self.rfile.read(length).decode('utf-8'))
+                if not isinstance(body, dict):
+                    raise ValueError("请求体必须是JSON对象")
+                return body
+
+            def _send_json(self, status: HTTPStatus, data: Dict[str, Any]) -> None:
+                body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                if daemon.verbose:
+                    super().log_message(format, *args)
+
+        return DaemonRequestHandler
+
+    def start(self) -> ThreadingHTTPServer:
+        """完整生成一次，然后启动生成线程并绑定HTTP服务器（不阻塞）"""
+        # 常驻期间修改的模板也应生效
+        self.generator.markdown_generator.jinja_env.auto_reload = True
+        self.generator.generate()
+        self.generator.markdown_generator.writer.take_changes()
+
+        self._builder = threading.Thread(target=self._run_builds, name="autodoc-daemon-builder", daemon=True)
+        self._builder.start()
+
+        self.httpd = _DaemonHTTPServer((self.host, self.port), self.make_handler())
+        self.port = self.httpd.server_address[1]
+        self._write_state_file()
+        return self.httpd
+
+    def _write_state_file(self) -> None:
+        """记录守护进程地址"""
+        state = {'pid': os.getpid(), 'host': self.host, 'port': self.port}
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        except OSError as e:
+            print(f"⚠️ 无法写入守护进程状态文件 {self.state_file}: {e}")
+
+    def serve_forever(self) -> None:
+        """启动守护进程并阻塞直到中断或收到 /shutdown"""
+        if self.httpd is None:
+            self.start()
+        print(f"🛰️ 文档守护进程: http://{self.host}:{self.port} (项目: {self.generator.project_path})")
+        print("按 Ctrl+C 停止")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """停止接收请求（serve_forever 返回后保存状态）"""
+        if self.httpd is not None:
+            self.httpd.shutdown()
+
+    def close(self) -> None:
+        """等待进行中的生成结束，保存状态并释放端口"""
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        if self._builder is not None:
+            self._builder.join()
+        self.generator.flush()
+        if self.httpd is not None:
+            self.httpd.server_close()
+        try:
+            self.state_file.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,266 @@
+"""
+文件发现 - 基于scandir遍历项目目录，支持glob排除规则和.gitignore
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 默认剪枝的目录（虚拟环境、依赖和缓存目录），规则语义与.gitignore相同
+DEFAULT_PRUNE_PATTERNS = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "__pycache__/",
+    "node_modules/",
+    ".venv/",
+    "venv/",
+    "site-packages/",
+    "dist-packages/",
+    ".tox/",
+    ".nox/",
+    ".eggs/",
+    "*.egg-info/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".autodoc-cache/",
+]
+
+def translate_glob(pattern: str) -> str:
+    """将glob模式转换为正则表达式
+
+    `*` 和 `?` 不匹配路径分隔符，`**` 可匹配任意层级目录，支持 `[...]` 字符集。
+    """
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 2] == '**':
+                if pattern[i + 2:i + 3] == '/':
+                    parts.append('(?:.*/)?')
+                    i += 3
+                else:
+                    parts.append('.*')
+                    i += 2
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[0] in '!^':
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+def compile_pattern(pattern: str) -> Optional[Tuple[str, bool, bool]]:
+    """编译单条规则，返回 (正则表达式, 是否为否定规则, 是否只匹配目录)
+
+    规则语义与.gitignore一致：不含 `/` 的规则匹配任意层级的名称，
+    含 `/` 的规则相对于规则所在目录匹配，结尾的 `/` 表示只匹配目录。
+    """
+    pattern = pattern.rstrip('\n\r')
+    if not pattern.strip() or pattern.startswith('#'):
+        return None
+
+    negated = pattern.startswith('!')
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith('\\'):
+        pattern = pattern[1:]
+
+    pattern = pattern.rstrip(' ')
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    if not pattern:
+        return None
+
+    anchored = '/' in pattern
+    regex = translate_glob(pattern.lstrip('/'))
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return regex, negated, dir_only
+
+class IgnoreRules:
+    """一组排除规则，按.gitignore语义匹配（后出现的规则优先）"""
+
+    def __init__(self, patterns: Iterable[str], base: str = ""):
+        # 规则所在目录（相对项目根目录，根目录为空字符串）
+        self.base = base
+        self.rules: List[Tuple["re.Pattern", bool, bool]] = []
+        for pattern in patterns:
+            compiled = compile_pattern(pattern)
+            if compiled is not None:
+                regex, negated, dir_only = compiled
+                self.rules.append((re.compile(regex + r'\Z'), negated, dir_only))
+
+        # 没有否定规则时，把规则合并成一个正则表达式快速匹配
+        self._combined_any = None
+        self._combined_dir = None
+        self.has_negation = any(negated for _, negated, _ in self.rules)
+        if not self.has_negation:
+            any_rules = [r.pattern for r, _, dir_only in self.rules if not dir_only]
+            dir_rules = [r.pattern for r, _, dir_only in self.rules if dir_only]
+            if any_rules:
+                self._combined_any = re.compile('|'.join(f'(?:{p})' for p in any_rules))
+            if dir_rules:
+                self._combined_dir = re.compile('|'.join(f'(?:{p})' for p in dir_rules))
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """匹配相对项目根目录的路径
+
+        Returns:
+            True 表示排除，False 表示被否定规则重新包含，None 表示没有规则匹配
+        """
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+
+        if not self.has_negation:
+            if self._combined_any is not None and self._combined_any.match(rel_path):
+                return True
+            if is_dir and self._combined_dir is not None and self._combined_dir.match(rel_path):
+                return True
+            return None
+
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negated
+        return None
+
+class FileDiscovery:
+    """项目文件发现
+
+    使用 os.scandir 遍历目录，排除规则只编译一次；被排除的目录整体剪枝，不再进入。
+    排除规则依次为：默认剪枝目录、配置中的排除模式（可用 `!` 重新包含），
+    最后是各级目录中的 .gitignore。结果按目录顺序和文件名排序，保证输出稳定。
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        exclude_patterns: Optional[List[str]] = None,
+        use_gitignore: bool = True,
+        prune_default_dirs: bool = True,
+        suffix: str = ".py"
+    ):
+        self.root = os.path.abspath(root)
+        self.suffix = suffix
+        self.use_gitignore = use_gitignore
+        patterns = (DEFAULT_PRUNE_PATTERNS if prune_default_dirs else []) + list(exclude_patterns or [])
+        self.rules = IgnoreRules(patterns)
+        self._gitignores: Dict[str, Optional[IgnoreRules]] = {}
+
+    def discover(self) -> List[Path]:
+        """查找项目中的所有匹配文件"""
+        results: List[Path] = []
+        self._walk(self.root, "", [], results)
+        return results
+
+    def _walk(self, dir_path: str, rel_dir: str, gitignores: List[IgnoreRules], results: List[Path]) -> None:
+        """遍历单个目录（先列出本目录文件，再按名称顺序进入子目录）"""
+        gitignore = self._load_gitignore(dir_path, rel_dir)
+        if gitignore:
+            gitignores = gitignores + [gitignore]
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not self._is_ignored(rel_path, True, gitignores):
+                        subdirs.append((entry.path, rel_path))
+                elif entry.name.endswith(self.suffix) and entry.is_file():
+                    if not self._is_ignored(rel_path, False, gitignores):
+                        results.append(Path(entry.path))
+            except OSError:
+                continue
+
+        for sub_path, sub_rel in subdirs:
+            self._walk(sub_path, sub_rel, gitignores, results)
+
+    def _is_ignored(self, rel_path: str, is_dir: bool, gitignores: List[IgnoreRules]) -> bool:
+        """判断路径是否被排除"""
+        decision = self.rules.match(rel_path, is_dir)
+        if decision is not None:
+            return decision
+
+        # 更深层目录的 .gitignore 优先
+        for rules in reversed(gitignores):
+            decision = rules.match(rel_path, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def _load_gitignore(self, dir_path: str, rel_dir: str) -> Optional[IgnoreRules]:
+        """读取目录中的 .gitignore（结果会被缓存）"""
+        if not self.use_gitignore:
+            return None
+        if dir_path not in self._gitignores:
+            rules = None
+            try:
+                with open(os.path.join(dir_path, '.gitignore'), 'r', encoding='utf-8') as f:
+                    rules = IgnoreRules(f.read().splitlines(), base=rel_dir)
+            except (OSError, UnicodeDecodeError):
+                pass
+            self._gitignores[dir_path] = rules
+        return self._gitignores[dir_path]
+
+    def sort_key(self, file_path: str) -> Tuple[Tuple[int, str], ...]:
+        """与 discover 结果顺序一致的排序键（同一目录下文件在子目录之前）"""
+        rel_path = os.path.relpath(os.path.abspath(file_path), self.root).replace(os.sep, '/')
+        parts = rel_path.split('/')
+        return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+    def is_excluded(self, file_path: str) -> bool:
+        """判断单个文件是否会被排除（用于监听模式中新出现的文件）"""
+        path = os.path.abspath(file_path)
+        if not path.endswith(self.suffix):
+            return True
+        rel_path = os.path.relpath(path, self.root).replace(os.sep, '/')
+        if rel_path == '.' or rel_path.startswith('../'):
+            return True
+
+        parts = rel_path.split('/')
+        gitignores: List[IgnoreRules] = []
+        dir_path, rel_dir = self.root, ""
+        for part in parts[:-1]:
+            gitignore = self._load_gitignore(dir_path, rel_dir)
+            if gitignore:
+                gitignores.append(gitignore)
+            dir_path = os.path.join(dir_path, part)
+            rel_dir = f"{rel_dir}/{part}" if rel_dir else part
+            if self._is_ignored(rel_dir, True, gitignores):
+                return True
+
+        gitignore = self._load_gitignore(dir_path, rel_dir)
+        if gitignore:
+            gitignores.append(gitignore)
+        return self._is_ignored(rel_path, False, gitignores)
@@ -0,0 +1,199 @@
+"""
+文档中间表示（doc IR）- 供下游步骤使用的结构化文档数据
+
+每行一个JSON记录（NDJSON）：第一行为项目记录，之后每个模块一行，
+包含符号、行号范围、分类和页面锚点。VitePress配置、搜索和统计等步骤
+可以直接读取这些数据，而不必重新解析生成的Markdown。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .parser import ClassInfo, FunctionInfo, ModuleInfo
+
+IR_FILE = "doc-ir.ndjson"
+IR_VERSION = 1
+
+def symbol_anchor(name: str) -> str:
+    """符号标题在页面中的锚点（与索引页面的链接一致）"""
+    return name.lower()
+
+def _summary(docstring: Optional[str]) -> str:
+    """文档字符串的第一行"""
+    for line in (docstring or "").splitlines():
+        line = line.strip()
+        if line:
+            return line
+    return ""
+
+def _is_documented(func: FunctionInfo) -> bool:
+    """与模块页面相同的文档化判断"""
+    return bool(getattr(func, '_doc_me', False))
+
+def _function_record(func: FunctionInfo, kind: str, parent: Optional[str] = None) -> Dict[str, Any]:
+    """函数或方法记录"""
+    record = {
+        "kind": kind,
+        "name": func.name,
+        "qualname": f"{parent}.{func.name}" if parent else func.name,
+        "anchor": symbol_anchor(func.name),
+        "signature": func.signature,
+        "summary": _summary(func.docstring),
+        "line": func.line_number,
+        "end_line": func.end_line_number,
+        "category": func.category,
+        "priority": func.priority,
+        "parameters": [
+            {"name": param.name, "type": param.type, "default": param.default}
+            for param in func.parameters
+        ],
+        "return_type": func.return_type,
+    }
+    if kind == "function":
+        record["documented"] = _is_documented(func)
+    return record
+
+def _class_record(cls: ClassInfo) -> Dict[str, Any]:
+    """类记录（方法单独作为符号记录）"""
+    return {
+        "kind": "class",
+        "name": cls.name,
+        "qualname": cls.name,
+        "anchor": symbol_anchor(cls.name),
+        "summary": _summary(cls.docstring),
+        "line": cls.line_number,
+        "end_line": cls.end_line_number,
+        "category": cls.category,
+        "priority": cls.priority,
+        "bases": list(cls.bases),
+    }
+
+def _sections(module: ModuleInfo) -> List[str]:
+    """模块页面的二级标题（与 module.j2 一致）"""
+    sections = ["📖 模块概览", "📦 导入"]
+    if any(_is_documented(func) for func in module.functions):
+        sections.append("🔧 函数")
+    if module.classes:
+        sections.append("🏗️ 类")
+    if any(not _is_documented(func) for func in module.functions):
+        sections.append("未文档化的函数")
+    return sections
+
+def module_record(module: ModuleInfo, project_path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """单个模块的记录"""
+    source = module.file_path
+    if source and project_path is not None:
+        source = Path(os.path.relpath(source, os.path.abspath(project_path))).as_posix()
+
+    symbols: List[Dict[str, Any]] = []
+    for func in module.functions:
+        symbols.append(_function_record(func, "function"))
+    for cls in module.classes:
+        symbols.append(_class_record(cls))
+        for method in cls.methods:
+            symbols.append(_function_record(method, "method", parent=cls.name))
+
+    return {
+        "kind": "module",
+        "name": module.name,
+        "title": f"{module.name} 模块",
+        "page": f"{module.name}.md",
+        "source": source,
+        "summary": _summary(module.docstring),
+        "sections": _sections(module),
+        "imports": list(module.imports),
+        "functions": len(module.functions),
+        "classes": len(module.classes),
+        "symbols": symbols,
+    }
+
+def project_record(project_name: str, modules: List[ModuleInfo]) -> Dict[str, Any]:
+    """项目记录（IR的第一行）"""
+    return {
+        "kind": "project",
+        "version": IR_VERSION,
+        "name": project_name,
+        "modules": len(modules),
+        "functions": sum(len(module.functions) for module in modules),
+        "classes": sum(len(module.classes) for module in modules),
+    }
+
+def _record_line(record: Dict[str, Any]) -> str:
+    """将记录序列化为一行JSON"""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+def _cache_key(module: ModuleInfo) -> str:
+    """记录行缓存的键"""
+    return module.file_path or module.name
+
+def refresh_module_lines(modules: List[ModuleInfo], project_path: Optional[Union[str, Path]],
+                         line_cache: Dict[str, Tuple[ModuleInfo, str]]) -> bool:
+    """只序列化给定的（变化的）模块并更新缓存，返回是否有记录行与缓存不同
+
+    增量更新时据此判断是否需要重写IR文件；没有缓存的模块视为变化。
+    """
+    changed = False
+    for module in modules:
+        key = _cache_key(module)
+        cached = line_cache.get(key)
+        if cached is not None and cached[0] is module:
+            continue
+        line = _record_line(module_record(module, project_path))
+        if cached is None or cached[1] != line:
+            changed = True
+        line_cache[key] = (module, line)
+    return changed
+
+def iter_ir_lines(project_name: str, modules: List[ModuleInfo],
+                  project_path: Optional[Union[str, Path]] = None,
+                  line_cache: Optional[Dict[str, Tuple[ModuleInfo, str]]] = None) -> Iterator[str]:
+    """逐行生成IR（按模块顺序，输出稳定）
+
+    line_cache 按文件路径缓存模块记录行，模块对象未变化时直接复用（增量更新时
+    只需序列化变化的模块）；生成结束后只保留本次涉及的模块。
+    """
+    yield _record_line(project_record(project_name, modules))
+
+    live = set()
+    for module in modules:
+        key = _cache_key(module)
+        cached = line_cache.get(key) if line_cache is not None else None
+        if cached is not None and cached[0] is module:
+            line = cached[1]
+        else:
+            line = _record_line(module_record(module, project_path))
+            if line_cache is not None:
+                line_cache[key] = (module, line)
+        live.add(key)
+        yield line
+
+    if line_cache is not None:
+        for key in set(line_cache) - live:
+            del line_cache[key]
+
+def load_doc_ir(path: Union[str, Path]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """读取IR，返回 (项目记录, 模块记录列表)
+
+    Raises:
+        OSError: 文件无法读取
+        ValueError: 文件格式或版本不匹配
+    """
+    project: Optional[Dict[str, Any]] = None
+    modules: List[Dict[str, Any]] = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("kind") == "project":
+                project = record
+            elif record.get("kind") == "module":
+                modules.append(record)
+
+    if project is None:
+        raise ValueError(f"缺少项目记录: {path}")
+    if project.get("version") != IR_VERSION:
+        raise ValueError(f"不支持的IR版本 {project.get('version')}: {path}")
+    return project, modules
@@ -2,12 +2,38 @@
 主要的文档生成器类
 """
 
+import json
 import os
+import time
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from .parser import PythonParser, ModuleInfo
+from .cache import PREFILTERED, ParseCache
+from .discovery import FileDiscovery
+from .changes import GitChangesError, git_changed_files, git_resolve, git_tree_blobs
+from .doc_ir import IR_FILE, iter_ir_lines, refresh_module_lines
 from .template_markdown_generator import TemplateMarkdownGenerator
+from .writer import atomic_write_bytes
+
+# 每次运行的耗时和缓存命中（不属于生成的文档，不记录在生成文件清单中）
+METRICS_FILE = ".autodoc-cache/metrics.json"
+
+# 子进程内使用的解析器（由进程池初始化函数设置）
+_worker_parser: Optional[PythonParser] = None
+
+def _init_parse_worker(parser: PythonParser) -> None:
+    """进程池初始化：在每个子进程中保存一份解析器"""
+    global _worker_parser
+    _worker_parser = parser
+
+def _parse_file_in_worker(file_path: Path) -> Tuple[Optional[ModuleInfo], Optional[str]]:
+    """在子进程中解析单个文件，异常以错误信息的形式返回给主进程"""
+    try:
+        return _worker_parser.parse_file(file_path), None
+    except Exception as e:
+        return None, str(e)
 
 class AutoDocGenerator:
     """自动文档生成器"""
@@ -19,7 +45,10 @@ class AutoDocGenerator:
         config_path: Optional[str] = None,
         include_all: bool = False,
         exclude_patterns: Optional[List[str]] = None,
-        enable_comment_markers: bool = True
+        enable_comment_markers: bool = True,
+        jobs: Optional[int] = None,
+        use_cache: Optional[bool] = None,
+        reproducible: Optional[bool] = None
     ):
         self.project_path = Path(project_path)
         self.output_path = Path(output_path)
@@ -31,14 +60,69 @@ class AutoDocGenerator:
         # 加载配置
         self.config = self._load_config()
         
+        # 并行解析的进程数（命令行参数优先于配置文件）
+        self.jobs = self._resolve_jobs(jobs if jobs is not None else self.config.get('jobs', 1))
+        
+        # Markdown输出选项
+        markdown_config = self.config.get('markdown') or {}
+        self.include_source = bool(markdown_config.get('include_source', True))
+        
         # 初始化组件
         self.parser = PythonParser(
             include_all=self.include_all,
-            enable_comment_markers=self.enable_comment_markers
+            enable_comment_markers=self.enable_comment_markers,
+            include_source=self.include_source
         )
+        # 可复现模式：相同输入生成字节级一致的输出（命令行参数优先于配置文件）
+        if reproducible is None:
+            reproducible = bool(self.config.get('reproducible', False))
+        self.reproducible = reproducible
+        
+        # 解析结果缓存（命令行参数优先于配置文件）
+        if use_cache is None:
+            use_cache = bool(self.config.get('cache', True))
+        self.use_cache = use_cache
+        self.cache: Optional[ParseCache] = None
+        
+        # 模板字节码与解析结果缓存在同一目录；批量生成时不检查模板文件变化
         self.markdown_generator = TemplateMarkdownGenerator(
-            output_path=str(self.output_path)
+            output_path=str(self.output_path),
+            reproducible=self.reproducible,
+            bytecode_cache_dir=str(self.output_path / ".autodoc-cache" / "jinja") if self.use_cache else None,
+            precompiled_dir=self.config.get('precompiled_templates'),
+            auto_reload=False,
+            jobs=self.jobs,
+            source_mode=markdown_config.get('source_mode', 'full'),
+            include_source=self.include_source,
+            include_toc=bool(markdown_config.get('include_toc', True)),
+            max_source_lines=markdown_config.get('max_source_lines', 0),
+            source_overflow=markdown_config.get('source_overflow', 'truncate'),
+            parser=self.parser
+        )
+        
+        # 文件发现（排除规则只编译一次）
+        self.discovery = FileDiscovery(
+            self.project_path,
+            exclude_patterns=self.config.get('exclude_patterns') or [],
+            use_gitignore=bool(self.config.get('use_gitignore', True)),
+            prune_default_dirs=bool(self.config.get('prune_default_dirs', True))
         )
+        
+        # 各阶段耗时（秒）
+        self.timings: Dict[str, float] = {}
+        
+        # 内存中的解析状态（供监听模式增量更新）：按发现顺序排列的文件及其模块信息
+        self._files: List[str] = []
+        self._modules: Dict[str, ModuleInfo] = {}
+        
+        # 预扫描阶段直接排除的文件数
+        self.prefiltered = 0
+        
+        # 解析时各文件的状态 (大小, mtime_ns, inode)，监听模式据此跳过构建已包含的变化
+        self._file_stats: Dict[str, Tuple[int, int, int]] = {}
+        
+        # 中间表示中各模块记录行的缓存（增量更新时只序列化变化的模块）
+        self._ir_lines: Dict[str, Tuple[ModuleInfo, str]] = {}
     
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
@@ -47,15 +131,31 @@ class AutoDocGenerator:
             'output_path': str(self.output_path),
             'include_all': self.include_all,
             'exclude_patterns': self.exclude_patterns,
+            'use_gitignore': True,
+            'prune_default_dirs': True,
+            'jobs': 1,
+            'cache': True,
+            'reproducible': False,
+            'precompiled_templates': None,
+            'doc_ir': True,
+            'watch': {
+                'quiet_period': 0.2,
+                'storm_threshold': 500,
+                'max_delay': 5.0
+            },
             'web': {
                 'port': 3000,
                 'host': 'localhost',
-                'theme': 'default'
+                'theme': 'default',
+                'sidebar': 'inline'
             },
             'markdown': {
                 'template': 'default',
                 'include_source': True,
-                'include_toc': True
+                'include_toc': True,
+                'source_mode': 'full',
+                'max_source_lines': 0,
+                'source_overflow': 'truncate'
             }
         }
         
@@ -69,8 +169,24 @@ class AutoDocGenerator:
         
         return config
     
-    def generate(self) -> None:
-        """生成文档"""
+    @staticmethod
+    def _resolve_jobs(jobs: Any) -> int:
+        """解析进程数配置，0或负数表示使用全部CPU核心"""
+        try:
+            jobs = int(jobs)
+        except (TypeError, ValueError):
+            jobs = 1
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        return jobs
+    
+    def generate(self, changed_since: Optional[str] = None) -> None:
+        """生成文档
+        
+        Args:
+            changed_since: git提交、分支或标签。指定后只重新解析相对于它发生变化的文件，
+                其余文件直接使用上次生成时缓存的解析结果，生成的文档与完整构建一致。
+        """
         print("🚀 开始生成文档...")
         
         # 验证项目路径
@@ -80,56 +196,333 @@ class AutoDocGenerator:
         # 创建输出目录
         self.output_path.mkdir(parents=True, exist_ok=True)
         
+        # 初始化解析缓存
+        if self.use_cache:
+            self.cache = ParseCache(
+                self.output_path / ".autodoc-cache",
+                options={
+                    'include_all': self.include_all,
+                    'enable_comment_markers': self.enable_comment_markers,
+                    'include_source': self.include_source
+                }
+            )
+            self.cache.git_head = self._git_head()
+        
+        self.timings = {}
+        
         # 查找Python文件
-        python_files = self._find_python_files()
-        print(f"📁 找到 {len(python_files)} 个Python文件")
+        start = time.perf_counter()
+        unchanged = None
+        python_files = None
+        if changed_since:
+            python_files, unchanged = self._find_changed_files(changed_since)
+        if python_files is None:
+            python_files = self._find_python_files()
+        self.timings['discovery'] = time.perf_counter() - start
+        print(f"📁 找到 {len(python_files)} 个Python文件 (耗时 {self.timings['discovery']:.3f} 秒)")
+        
+        start = time.perf_counter()
         
         # 解析所有文件
-        modules = []
-        for file_path in python_files:
-            try:
-                module_info = self.parser.parse_file(file_path)
-                if module_info.functions or module_info.classes:
-                    modules.append(module_info)
-                    print(f"✅ 解析文件: {file_path.name}")
-            except Exception as e:
-                print(f"❌ 解析文件失败 {file_path.name}: {e}")
+        self._files = [os.path.abspath(file_path) for file_path in python_files]
+        self._modules = {}
+        self._file_stats = {}
+        self.prefiltered = 0
+        for file_path, module_info, error in self._parse_files(python_files, unchanged):
+            if error is not None:
+                print(f"❌ 解析文件失败 {file_path.name}: {error}")
+            elif module_info.functions or module_info.classes:
+                self._modules[os.path.abspath(file_path)] = module_info
+                print(f"✅ 解析文件: {file_path.name}")
+        
+        if self.cache:
+            self.cache.save()
+            cache_stats = self.cache.get_stats()
+            print(f"💾 解析缓存: 命中 {cache_stats['hits']}, 未命中 {cache_stats['misses']}")
         
-        print(f"📊 解析完成: {len(modules)} 个模块")
+        if self.parser.can_prefilter:
+            print(f"⏭️ 预扫描跳过: {self.prefiltered} 个无标记文件")
+        
+        modules = self._current_modules()
+        self.timings['parse'] = time.perf_counter() - start
+        print(f"📊 解析完成: {len(modules)} 个模块 (耗时 {self.timings['parse']:.3f} 秒)")
+        
+        # 加载模板（首次编译，之后命中字节码缓存或预编译模板）
+        start = time.perf_counter()
+        self.markdown_generator.load_templates()
+        self.timings['template_compile'] = time.perf_counter() - start
         
         # 生成文档
+        start = time.perf_counter()
         project_name = self.config.get('project_name', 'Project')
-        self.markdown_generator.generate_documentation(modules, project_name)
+        writer = self.markdown_generator.writer
+        writer.begin_build()
+        self.markdown_generator.generate_pages(modules, project_name)
+        self.timings['render'] = time.perf_counter() - start
         
         print(f"📝 文档生成完成: {self.output_path}")
         
+        # 生成结构化中间表示
+        self._generate_doc_ir(modules)
+        
         # 生成统计信息
         self._generate_stats(modules)
+        
+        # 删除已不存在模块的页面
+        writer.finish_build()
+        
+        write_stats = writer.get_stats()
+        print(f"💾 输出文件: 写入 {write_stats['written']}, 未变化 {write_stats['skipped']}, 删除 {write_stats['deleted']}")
+        
+        self._save_metrics(write_stats)
     
-    def _find_python_files(self) -> List[Path]:
-        """查找Python文件"""
-        python_files = []
+    def _current_modules(self) -> List[ModuleInfo]:
+        """按文件发现顺序返回当前包含的模块"""
+        return [self._modules[path] for path in self._files if path in self._modules]
+    
+    @staticmethod
+    def _module_summary(module_info: Optional[ModuleInfo]) -> Any:
+        """模块在概览和索引页中的摘要（符号名称及分类）"""
+        if module_info is None:
+            return None
+        return (
+            module_info.name,
+            tuple((f.name, f.category) for f in module_info.functions),
+            tuple((c.name, c.category) for c in module_info.classes)
+        )
+    
+    def regenerate_file(self, file_path: str) -> None:
+        """增量更新单个文件的文档"""
+        self.regenerate_files([file_path])
+    
+    def regenerate_files(self, file_paths: List[str]) -> None:
+        """增量更新一批文件的文档
+        
+        只重新解析变化的文件并重新生成其模块页面；中间表示只序列化变化的模块，
+        有记录变化时才重写。仅当有模块的符号列表或分类发生变化时，才重新生成概览、
+        索引和统计信息。
+        已删除的文件移除其页面，新出现的文件按发现顺序加入。
+        """
+        if not self._files:
+            self.generate()
+            return
         
-        for root, dirs, files in os.walk(self.project_path):
-            # 排除不需要的目录
-            dirs[:] = [d for d in dirs if not self._should_exclude(d)]
+        known = set(self._files)
+        to_parse: List[Path] = []
+        added: List[str] = []
+        removed: List[str] = []
+        for file_path in dict.fromkeys(os.path.abspath(path) for path in file_paths):
+            if os.path.exists(file_path):
+                if file_path not in known:
+                    if self.discovery.is_excluded(file_path):
+                        continue
+                    added.append(file_path)
+                to_parse.append(Path(file_path))
+            elif file_path in known:
+                removed.append(file_path)
+        
+        if not to_parse and not removed:
+            return
+        
+        if removed:
+            removed_set = set(removed)
+            self._files = [path for path in self._files if path not in removed_set]
+        if added:
+            # 新文件的位置与完整构建一致
+            self._files = sorted(self._files + added, key=self.discovery.sort_key)
+        
+        summary_changed = False
+        updated: List[ModuleInfo] = []
+        
+        for path in removed:
+            self._file_stats.pop(path, None)
+            if self.cache:
+                self.cache.forget(Path(path))
+            old_module = self._modules.pop(path, None)
+            if old_module is not None:
+                self.markdown_generator.remove_module(old_module)
+                summary_changed = True
+        
+        for file_path, module_info, error in self._parse_files(to_parse):
+            path = str(file_path)
+            if error is not None:
+                print(f"❌ 解析文件失败 {file_path.name}: {error}")
+                continue
+            
+            old_module = self._modules.get(path)
+            new_module = module_info if module_info.functions or module_info.classes else None
+            if new_module is not None:
+                self._modules[path] = new_module
+                self.markdown_generator.generate_module(new_module)
+                updated.append(new_module)
+            else:
+                self._modules.pop(path, None)
+                if old_module is not None:
+                    self.markdown_generator.remove_module(old_module)
             
-            for file in files:
-                if file.endswith('.py') and not self._should_exclude(file):
-                    file_path = Path(root) / file
-                    python_files.append(file_path)
+            if self._module_summary(old_module) != self._module_summary(new_module):
+                summary_changed = True
+        
+        # 中间表示包含行号范围等细节：只序列化变化的模块，其记录行和模块列表都没有变化时不重写
+        modules = self._current_modules()
+        if self.config.get('doc_ir', True):
+            lines_changed = refresh_module_lines(updated, self.project_path, self._ir_lines)
+            if lines_changed or summary_changed:
+                self._generate_doc_ir(modules)
         
-        return python_files
+        if summary_changed:
+            project_name = self.config.get('project_name', 'Project')
+            self.markdown_generator.generate_summary(modules, project_name, save_stats=False)
+            self._generate_stats(modules)
+        else:
+            self.markdown_generator.writer.save_manifest()
     
-    def _should_exclude(self, name: str) -> bool:
-        """判断是否应该排除"""
-        exclude_patterns = self.config.get('exclude_patterns', [])
+    def flush(self) -> None:
+        """保存解析缓存索引和生成文件清单（增量更新之后，供下次启动直接使用）"""
+        if self.cache:
+            self.cache.git_head = self._git_head()
+            self.cache.save()
+        self.markdown_generator.writer.save_manifest()
+    
+    def _git_head(self) -> Optional[str]:
+        """项目当前所在的git提交（不在git仓库中时为None）"""
+        try:
+            return git_resolve(str(self.project_path), "HEAD")
+        except GitChangesError:
+            return None
+    
+    def _find_changed_files(self, ref: str) -> Tuple[Optional[List[Path]], Dict[str, str]]:
+        """根据git变更和上次生成的文件列表确定本次的文件
         
-        for pattern in exclude_patterns:
-            if pattern in name or name.startswith(pattern):
-                return True
+        只有上次生成时项目位于 ref 指向的提交，上次的文件列表和解析记录才能代表 ref 的内容；
+        否则完整查找文件，每个文件按文件状态检查缓存。
+        
+        Returns:
+            (文件列表, 未变化的文件 -> 其在 ref 中的blob ID)；无法使用增量模式时文件列表为None，需完整查找
+        """
+        previous = self.cache.previous_files() if self.cache else []
+        if not previous:
+            print("⚠️ 没有可用的上次生成记录（需要启用解析缓存），将进行完整构建")
+            return None, {}
+        
+        try:
+            ref_commit = git_resolve(str(self.project_path), ref)
+            if self.cache.previous_git_head != ref_commit:
+                print(f"⚠️ 上次生成不是在 {ref} 上进行的，将完整查找文件并按文件状态检查缓存")
+                return None, {}
+            changed, deleted = git_changed_files(str(self.project_path), ref_commit)
+            blobs = git_tree_blobs(str(self.project_path), ref_commit)
+        except GitChangesError as e:
+            print(f"⚠️ 无法获取相对于 {ref} 的变更: {e}，将进行完整构建")
+            return None, {}
         
-        return False
+        # 未被git跟踪的文件删除后不在git报告的删除列表中
+        files = {path for path in previous if path not in deleted and os.path.exists(path)}
+        for path in changed:
+            if os.path.isfile(path) and not self.discovery.is_excluded(path):
+                files.add(path)
+            else:
+                files.discard(path)
+        
+        print(f"🔀 相对于 {ref}: {len(changed)} 个文件新增或修改, {len(deleted)} 个文件删除")
+        ordered = sorted(files, key=self.discovery.sort_key)
+        unchanged = {path: blobs[path] for path in files - changed if path in blobs}
+        return [Path(path) for path in ordered], unchanged
+    
+    def _parse_files(self, python_files: List[Path],
+                     unchanged: Optional[Dict[str, str]] = None) -> List[Tuple[Path, Optional[ModuleInfo], Optional[str]]]:
+        """解析文件列表，返回 (文件路径, 模块信息, 错误信息)，顺序与输入一致
+        
+        unchanged 中的文件已知与基准提交相同，上次记录的内容也与基准提交相同时
+        直接按记录读取缓存，不再检查文件状态；其余文件按文件状态检查缓存。
+        """
+        results = {}
+        
+        # 先从缓存中读取，再预扫描排除无标记的文件，只解析剩下的文件
+        to_parse = []
+        for file_path in python_files:
+            # 在读取内容之前记录文件状态：之后的修改一定会使状态不同
+            self._record_file_stat(os.path.abspath(file_path))
+            module_info = None
+            if self.cache:
+                blob = unchanged.get(os.path.abspath(file_path)) if unchanged else None
+                if blob is not None:
+                    module_info = self.cache.load_recorded(file_path, blob)
+                if module_info is None:
+                    module_info = self.cache.load(file_path)
+            if module_info is None and not self._may_contain_symbols(file_path):
+                module_info = PREFILTERED
+                if self.cache:
+                    self.cache.store_prefiltered(file_path)
+            if module_info is PREFILTERED:
+                self.prefiltered += 1
+                module_info = ModuleInfo(
+                    name=file_path.stem,
+                    docstring="",
+                    functions=[],
+                    classes=[],
+                    imports=[]
+                )
+            if module_info is not None:
+                results[file_path] = (module_info, None)
+            else:
+                to_parse.append(file_path)
+        
+        for file_path, module_info, error in self._run_parser(to_parse):
+            if error is None and self.cache:
+                self.cache.store(file_path, module_info)
+            results[file_path] = (module_info, error)
+        
+        return [(file_path, *results[file_path]) for file_path in python_files]
+    
+    def _may_contain_symbols(self, file_path: Path) -> bool:
+        """预扫描文件，读取失败时交给解析器报告错误"""
+        try:
+            return self.parser.may_contain_symbols(file_path)
+        except OSError:
+            return True
+    
+    def _run_parser(self, python_files: List[Path]) -> List[Tuple[Path, Optional[ModuleInfo], Optional[str]]]:
+        """实际解析文件（串行或多进程）"""
+        if self.jobs <= 1 or len(python_files) <= 1:
+            results = []
+            for file_path in python_files:
+                try:
+                    results.append((file_path, self.parser.parse_file(file_path), None))
+                except Exception as e:
+                    results.append((file_path, None, str(e)))
+            return results
+        
+        workers = min(self.jobs, len(python_files))
+        chunksize = max(1, len(python_files) // (workers * 4))
+        print(f"⚙️ 使用 {workers} 个进程并行解析")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parse_worker,
+            initargs=(self.parser,)
+        ) as executor:
+            parsed = executor.map(_parse_file_in_worker, python_files, chunksize=chunksize)
+            return [(file_path, module_info, error)
+                    for file_path, (module_info, error) in zip(python_files, parsed)]
+    
+    def _find_python_files(self) -> List[Path]:
+        """查找Python文件"""
+        return self.discovery.discover()
+    
+    def _generate_doc_ir(self, modules: List[ModuleInfo]) -> None:
+        """生成结构化中间表示（每个模块一行JSON）"""
+        if not self.config.get('doc_ir', True):
+            return
+        
+        ir_file = self.output_path / IR_FILE
+        project_name = self.config.get('project_name', 'Project')
+        try:
+            if self.markdown_generator.writer.write_stream(
+                ir_file, iter_ir_lines(project_name, modules, self.project_path, self._ir_lines)
+            ):
+                print(f"✅ 生成中间表示: {ir_file}")
+        except Exception as e:
+            print(f"❌ 生成中间表示失败: {e}")
     
     def _generate_stats(self, modules: List[ModuleInfo]) -> None:
         """生成统计信息"""
@@ -144,48 +537,180 @@ class AutoDocGenerator:
             'output_path': str(self.output_path)
         }
         
+        if self.parser.can_prefilter:
+            stats['prefiltered'] = self.prefiltered
+        
+        if self.reproducible:
+            # 绝对路径因运行环境而异，可复现模式下不输出
+            del stats['generated_at']
+            del stats['output_path']
+        elif self.cache:
+            # 缓存命中与上次运行有关，可复现模式下不输出
+            stats['cache'] = self.cache.get_stats()
+        
         stats_file = self.output_path / "stats.json"
-        import json
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False)
+        self.markdown_generator.writer.write_text(stats_file, json.dumps(stats, indent=2, ensure_ascii=False))
         
         print(f"📈 统计信息: {total_functions} 个函数, {total_classes} 个类")
     
-    def watch_and_generate(self) -> None:
-        """监听文件变化并自动重新生成"""
+    def _save_metrics(self, write_stats: Dict[str, int]) -> None:
+        """保存本次运行的各阶段耗时和输出写入统计（每次运行都不同，不写入发布的 stats.json）"""
+        metrics: Dict[str, Any] = {
+            'timing': {name: round(seconds, 4) for name, seconds in self.timings.items()},
+            'output': write_stats
+        }
+        
+        metrics_file = self.output_path / METRICS_FILE
+        try:
+            atomic_write_bytes(metrics_file, json.dumps(metrics, indent=2, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ 无法保存运行指标 {metrics_file}: {e}")
+    
+    def _publish_changes(self, hub, source_mtime: Optional[float]) -> List[str]:
+        """将本次生成实际变化的页面推送给实时刷新客户端，返回变化的输出文件"""
+        files = self.markdown_generator.writer.take_changes()
+        if hub is None or not files:
+            return files
+        event = hub.publish(files, source_mtime)
+        if event['pages'] and source_mtime is not None:
+            latency = (event['pushed_at'] - source_mtime) * 1000
+            print(f"⚡ 推送 {len(event['pages'])} 个页面到 {hub.client_count} 个客户端 (保存到推送 {latency:.0f}ms)")
+        return files
+    
+    @staticmethod
+    def _stat_signature(path: str) -> Tuple[int, int, int]:
+        """文件状态签名 (大小, mtime_ns, inode)"""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+    
+    def _record_file_stat(self, path: str) -> None:
+        """记录解析时的文件状态"""
+        try:
+            self._file_stats[path] = self._stat_signature(path)
+        except OSError:
+            self._file_stats.pop(path, None)
+    
+    def _modified_since_build(self, path: str) -> bool:
+        """文件状态是否与构建时记录的不同
+        
+        同时比较大小、mtime和inode：移动或重命名覆盖已有文件时mtime不变，但inode不同。
+        已删除的文件和构建时没有记录的文件都视为变化。
+        """
+        recorded = self._file_stats.get(path)
+        if recorded is None:
+            return True
+        try:
+            return self._stat_signature(path) != recorded
+        except OSError:
+            return True
+    
+    def apply_changes(self, batch, hub=None, storm_threshold: int = 500,
+                      force: bool = False) -> Tuple[str, List[str]]:
+        """处理一批合并后的文件变化（监听模式的生成线程中调用）
+        
+        变化的文件超过 storm_threshold（例如切换git分支）或有目录被删除、移动时执行完整重建。
+        文件状态与构建时记录相同的文件已包含在构建结果中，不再重复处理；
+        来自创建或移动事件的文件（batch.forced）总是重新处理。
+        
+        Args:
+            force: 不检查文件状态，重新处理所有文件（调用方明确要求的重新生成）
+        
+        Returns:
+            (处理方式, 实际变化的输出文件)；处理方式为 "full"（完整重建）、
+            "incremental"（增量更新）或 "skipped"（无需处理）
+        """
+        paths = [path for path in batch.paths
+                 if force or path in batch.forced or self._modified_since_build(path)]
+        if not paths and not batch.full:
+            return "skipped", []
+        
+        if batch.full or len(paths) > storm_threshold:
+            print(f"🌪️ {len(paths)} 个文件变化（{batch.events} 个事件），执行完整重建")
+            self.generate()
+            return "full", self._publish_changes(hub, batch.last_event_time)
+        
+        if len(paths) == 1:
+            print(f"🔄 检测到文件变化: {paths[0]}")
+        else:
+            print(f"🔄 检测到 {len(paths)} 个文件变化（{batch.events} 个事件）")
+        
+        source_mtime = batch.last_event_time
+        for path in paths:
+            try:
+                source_mtime = max(source_mtime, os.stat(path).st_mtime)
+            except OSError:
+                pass
+        
+        self.regenerate_files(paths)
+        return "incremental", self._publish_changes(hub, source_mtime)
+    
+    def watch_and_generate(self, livereload_port: Optional[int] = None,
+                           livereload_host: str = "localhost") -> None:
+        """监听文件变化并自动重新生成
+        
+        文件事件经过合并后由单独的生成线程处理，同一时间只有一次生成。
+        
+        Args:
+            livereload_port: 指定后启动实时刷新服务器，每次增量生成后推送变化的页面
+            livereload_host: 实时刷新服务器地址
+        """
+        import threading
         from watchdog.observers import Observer
-        from watchdog.events import FileSystemEventHandler
+        from .watcher import ChangeHandler, ChangeQueue
         
-        class DocGeneratorHandler(FileSystemEventHandler):
-            def __init__(self, generator):
-                self.generator = generator
-                self.last_generated = 0
-            
-            def on_modified(self, event):
-                if event.is_directory:
+        watch_config = self.config.get('watch') or {}
+        changes = ChangeQueue(
+            quiet_period=float(watch_config.get('quiet_period', 0.2)),
+            max_delay=float(watch_config.get('max_delay', 5.0))
+        )
+        storm_threshold = int(watch_config.get('storm_threshold', 500))
+        
+        # 监听期间修改的模板也应生效
+        self.markdown_generator.jinja_env.auto_reload = True
+        
+        # 先完整生成一次，建立内存中的解析状态
+        self.generate()
+        self.markdown_generator.writer.take_changes()
+        
+        hub = None
+        livereload_server = None
+        if livereload_port is not None:
+            from .livereload import SCRIPT_PATH, LiveReloadHub, LiveReloadServer
+            hub = LiveReloadHub()
+            livereload_server = LiveReloadServer(hub, host=livereload_host, port=livereload_port)
+        
+        def build_loop() -> None:
+            while True:
+                batch = changes.get()
+                if batch is None:
                     return
-                
-                if event.src_path.endswith('.py'):
-                    import time
-                    current_time = time.time()
-                    if current_time - self.last_generated > 2:  # 防抖
-                        print(f"🔄 检测到文件变化: {event.src_path}")
-                        self.generator.generate()
-                        self.last_generated = current_time
-        
-        event_handler = DocGeneratorHandler(self)
+                try:
+                    self.apply_changes(batch, hub, storm_threshold)
+                except Exception as e:
+                    print(f"❌ 重新生成失败: {e}")
+        
+        builder = threading.Thread(target=build_loop, name="autodoc-builder", daemon=True)
+        builder.start()
+        
         observer = Observer()
-        observer.schedule(event_handler, str(self.project_path), recursive=True)
+        observer.schedule(ChangeHandler(changes, self.discovery.suffix), str(self.project_path), recursive=True)
         observer.start()
         
         print(f"👀 开始监听文件变化: {self.project_path}")
+        if livereload_server is not None:
+            livereload_server.start()
+            print(f"⚡ 实时刷新: 在页面中加入 <script src=\"{livereload_server.url}{SCRIPT_PATH}\"></script>")
         print("按 Ctrl+C 停止监听")
         
         try:
             while True:
-                import time
                 time.sleep(1)
         except KeyboardInterrupt:
             observer.stop()
             observer.join()
-            print("🛑 停止监听") 
\ No newline at end of file
+            # 等待进行中的生成结束
+            changes.close()
+            builder.join()
+            if livereload_server is not None:
+                livereload_server.shutdown()
+            print("🛑 停止监听")
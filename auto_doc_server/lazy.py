@@ -0,0 +1,126 @@
+"""
+按需生成模式 - 启动时只发现文件，模块页面在首次请求时才解析和渲染
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .generator import AutoDocGenerator
+from .server import HTML_CONTENT_TYPE, DocsServer, RenderedPage, build_page
+
+class LazyDocsServer(DocsServer):
+    """按需生成文档的内置服务器
+
+    启动时只执行文件发现并立即列出所有模块；模块页面在首次请求时解析和渲染，
+    结果按源文件内容哈希缓存。源文件的 mtime 或大小变化后重新计算哈希，
+    内容确实变化时才重新解析。解析和渲染选项与 generate 相同（读取同一配置文件）。
+    """
+
+    def __init__(self, generator: AutoDocGenerator, host: str = "localhost", port: int = 3000,
+                 cache_bytes: int = 64 * 1024 * 1024, verbose: bool = False,
+                 refresh_interval: float = 5.0):
+        super().__init__(generator.project_path, host=host, port=port,
+                         cache_bytes=cache_bytes, verbose=verbose)
+        self.generator = generator
+        # 首页请求时重新发现文件的最小间隔（秒）
+        self.refresh_interval = refresh_interval
+
+        # 页面名（模块名）到源文件路径的映射，按发现顺序排列
+        self._pages: Dict[str, str] = {}
+        self._discovered_at = 0.0
+        self._discover_lock = threading.Lock()
+
+        self.discover()
+
+    def discover(self) -> None:
+        """发现项目中的文件（同名模块以后发现的为准，与 generate 一致）"""
+        start = time.perf_counter()
+        files = self.generator.discovery.discover()
+        pages: Dict[str, str] = {}
+        for file_path in files:
+            pages[file_path.stem] = os.path.abspath(file_path)
+        with self._discover_lock:
+            self._pages = pages
+            self._discovered_at = time.monotonic()
+        if self.verbose:
+            print(f"📁 发现 {len(files)} 个Python文件 (耗时 {time.perf_counter() - start:.3f} 秒)")
+
+    def _refresh(self) -> None:
+        """距上次发现超过刷新间隔时重新发现文件"""
+        if time.monotonic() - self._discovered_at >= self.refresh_interval:
+            self.discover()
+
+    def page_names(self) -> List[str]:
+        """当前发现的所有页面名"""
+        with self._discover_lock:
+            return list(self._pages)
+
+    def get_response(self, url_path: str) -> Optional[Tuple[RenderedPage, str]]:
+        """首页列出所有模块，模块页面按需生成；不提供其他文件"""
+        name = url_path.strip('/')
+        for suffix in ('.md', '.html'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+
+        if name in ('', 'index', 'overview'):
+            self._refresh()
+            return self._index_page(), HTML_CONTENT_TYPE
+
+        with self._discover_lock:
+            source_path = self._pages.get(name)
+        if source_path is None:
+            return None
+
+        try:
+            digest, _ = self.file_hash(Path(source_path))
+        except OSError:
+            # 文件已被删除
+            self.discover()
+            return None
+        return self._module_page(source_path, digest), HTML_CONTENT_TYPE
+
+    def _module_page(self, source_path: str, source_hash: str) -> RenderedPage:
+        """解析并渲染单个模块（按源文件路径和内容哈希缓存）"""
+        key = f"module:{source_path}:{source_hash}"
+
+        def render() -> RenderedPage:
+            start = time.perf_counter()
+            module_info = self.generator.parser.parse_file(Path(source_path))
+            content = self.generator.markdown_generator.render_module(module_info)
+            page = build_page(content, hashlib.sha256(key.encode('utf-8')).hexdigest(), self.page_head)
+            if self.verbose:
+                print(f"🔄 按需生成: {module_info.name} (耗时 {time.perf_counter() - start:.3f} 秒)")
+            return page
+
+        return self.cache.get_or_render(key, render)
+
+    def _index_page(self) -> RenderedPage:
+        """列出所有已发现模块的首页（模块列表变化时重新渲染）"""
+        with self._discover_lock:
+            pages = list(self._pages.items())
+
+        project_name = self.generator.config.get('project_name', 'Project')
+        lines = [
+            f"# {project_name} 文档索引",
+            "",
+            "按需生成模式：模块页面在首次访问时解析和渲染。",
+            "",
+            f"## 📚 模块文档（{len(pages)} 个）",
+            "",
+        ]
+        for name, source_path in pages:
+            relative = Path(os.path.relpath(source_path, self.generator.project_path)).as_posix()
+            lines.append(f"- [{name}](./{name}.md) - `{relative}`")
+        content = "\n".join(lines) + "\n"
+
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return self.cache.get_or_render(f"index:{digest}", lambda: build_page(content, digest, self.page_head))
+
+    def banner(self) -> str:
+        """启动时输出的说明"""
+        return (f"🌐 按需生成文档服务器: http://{self.host}:{self.port} "
+                f"(项目: {self.generator.project_path}, {len(self.page_names())} 个模块)")
@@ -0,0 +1,239 @@
+"""
+实时刷新 - 监听模式下通过 Server-Sent Events 推送变化的页面
+
+每次增量生成后向所有连接的浏览器推送变化页面的路由，客户端脚本只在当前页面
+发生变化时刷新。浏览器刷新后回报从保存源文件到页面刷新完成的耗时。
+"""
+
+import json
+import queue
+from collections import deque
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+EVENTS_PATH = "/__livereload"
+SCRIPT_PATH = "/__livereload.js"
+REPORT_PATH = "/__livereload/report"
+
+# 没有事件时发送心跳的间隔（秒），用于发现已断开的连接
+HEARTBEAT_INTERVAL = 15.0
+
+# 保留最近多少次浏览器回报的刷新耗时（监听进程长时间运行，不能无限增长）
+MAX_LATENCIES = 1000
+
+CLIENT_SCRIPT = """(function () {
+  var KEY = "autodoc-livereload";
+  var script = document.currentScript;
+  var base = script ? script.src.replace(/\\/__livereload\\.js.*$/, "") : "";
+
+  function route(path) {
+    path = decodeURIComponent(path).replace(/\\.(md|html)$/, "").replace(/\\/index$/, "/");
+    return path || "/";
+  }
+
+  function affected(pages, current) {
+    for (var i = 0; i < pages.length; i++) {
+      if (pages[i] === current || (pages[i] !== "/" && current.slice(-pages[i].length) === pages[i])) {
+        return true;
+      }
+    }
+    return false;
+  }
+
+  var pending = sessionStorage.getItem(KEY);
+  if (pending) {
+    sessionStorage.removeItem(KEY);
+    var latency = Date.now() - JSON.parse(pending).source_mtime * 1000;
+    console.info("[auto-doc] 保存到刷新: " + latency.toFixed(0) + "ms");
+    if (navigator.sendBeacon) {
+      navigator.sendBeacon(base + "/__livereload/report",
+        JSON.stringify({page: route(location.pathname), latency_ms: latency}));
+    }
+  }
+
+  var source = new EventSource(base + "/__livereload");
+  source.addEventListener("reload", function (event) {
+    var data = JSON.parse(event.data);
+    if (affected(data.pages, route(location.pathname))) {
+      if (data.source_mtime) {
+        sessionStorage.setItem(KEY, JSON.stringify({source_mtime: data.source_mtime}));
+      }
+      location.reload();
+    }
+  });
+})();
+"""
+
+def page_routes(files: Iterable[str]) -> List[str]:
+    """将输出目录中变化的文件（相对路径）转换为页面路由，非页面文件忽略"""
+    routes = set()
+    for relative in files:
+        path = PurePosixPath(relative)
+        if path.suffix != ".md":
+            continue
+        route = "/" + path.with_suffix("").as_posix()
+        if path.stem == "index":
+            route = route[:-len("index")]
+        routes.add(route)
+    return sorted(routes)
+
+class LiveReloadHub:
+    """管理SSE连接并向所有客户端广播变化事件"""
+
+    def __init__(self):
+        self._clients: Set["queue.Queue[Optional[str]]"] = set()
+        self._lock = threading.Lock()
+        # 最近的保存到刷新耗时（毫秒）
+        self.latencies: "deque[float]" = deque(maxlen=MAX_LATENCIES)
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def subscribe(self) -> "queue.Queue[Optional[str]]":
+        """注册一个客户端，返回其事件队列"""
+        events: "queue.Queue[Optional[str]]" = queue.Queue()
+        with self._lock:
+            self._clients.add(events)
+        return events
+
+    def unsubscribe(self, events: "queue.Queue[Optional[str]]") -> None:
+        with self._lock:
+            self._clients.discard(events)
+
+    def publish(self, files: List[str], source_mtime: Optional[float] = None) -> Dict[str, Any]:
+        """推送一次增量生成的结果
+
+        Args:
+            files: 实际变化的输出文件（相对输出目录的路径）
+            source_mtime: 触发本次生成的源文件的修改时间，用于计算保存到刷新的耗时
+        """
+        event = {
+            "pages": page_routes(files),
+            "files": sorted(files),
+            "source_mtime": source_mtime,
+            "pushed_at": time.time(),
+        }
+        data = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            clients = list(self._clients)
+        for events in clients:
+            events.put(data)
+        return event
+
+    def report(self, page: str, latency_ms: float) -> None:
+        """记录浏览器回报的保存到刷新耗时"""
+        self.latencies.append(latency_ms)
+        print(f"⏱️ 保存到刷新: {page} {latency_ms:.0f}ms")
+
+    def close(self) -> None:
+        """通知所有客户端连接结束"""
+        with self._lock:
+            clients = list(self._clients)
+        for events in clients:
+            events.put(None)
+
+class _LiveReloadHTTPServer(ThreadingHTTPServer):
+    """每个连接一个线程的HTTP服务器（SSE连接长时间占用线程）"""
+    daemon_threads = True
+
+class LiveReloadServer:
+    """提供SSE事件流、客户端脚本和耗时回报接口的HTTP服务器"""
+
+    def __init__(self, hub: LiveReloadHub, host: str = "localhost", port: int = 35729):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def make_handler(self) -> type:
+        """创建绑定到本服务器的请求处理类"""
+        hub = self.hub
+
+        class LiveReloadRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                if path == EVENTS_PATH:
+                    self._stream_events()
+                elif path == SCRIPT_PATH:
+                    self._send(HTTPStatus.OK, CLIENT_SCRIPT.encode('utf-8'),
+                               "application/javascript; charset=utf-8")
+                else:
+                    self._send(HTTPStatus.NOT_FOUND, b"404 Not Found", "text/plain; charset=utf-8")
+
+            def do_POST(self):
+                if urlsplit(self.path).path != REPORT_PATH:
+                    self._send(HTTPStatus.NOT_FOUND, b"404 Not Found", "text/plain; charset=utf-8")
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    report = json.loads(self.rfile.read(min(length, 4096)).decode('utf-8'))
+                    hub.report(str(report.get("page", "")), float(report["latency_ms"]))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self._send(HTTPStatus.BAD_REQUEST, b"400 Bad Request", "text/plain; charset=utf-8")
+                    return
+                self._send(HTTPStatus.NO_CONTENT, b"", "text/plain; charset=utf-8")
+
+            def _stream_events(self) -> None:
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+
+                events = hub.subscribe()
+                try:
+                    self.wfile.write(b"retry: 1000\n\n")
+                    self.wfile.flush()
+                    while True:
+                        try:
+                            data = events.get(timeout=HEARTBEAT_INTERVAL)
+                        except queue.Empty:
+                            self.wfile.write(b": ping\n\n")
+                            self.wfile.flush()
+                            continue
+                        if data is None:
+                            break
+                        self.wfile.write(f"event: reload\ndata: {data}\n\n".encode('utf-8'))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    hub.unsubscribe(events)
+
+            def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return LiveReloadRequestHandler
+
+    def start(self) -> ThreadingHTTPServer:
+        """在后台线程中启动服务器"""
+        self.httpd = _LiveReloadHTTPServer((self.host, self.port), self.make_handler())
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self.httpd
+
+    def shutdown(self) -> None:
+        """关闭所有事件流并停止服务器"""
+        self.hub.close()
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
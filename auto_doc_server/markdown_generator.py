@@ -5,15 +5,16 @@ Markdown文档生成器
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from .parser import ModuleInfo, FunctionInfo, ClassInfo
+from .build_time import format_build_time
 
 class MarkdownGenerator:
     """Markdown文档生成器"""
     
-    def __init__(self, output_path: str = "./docs", template: str = "default"):
+    def __init__(self, output_path: str = "./docs", template: str = "default", reproducible: bool = False):
         self.output_path = Path(output_path)
         self.template = template
+        self.reproducible = reproducible
         self.output_path.mkdir(parents=True, exist_ok=True)
     
     def generate_documentation(self, modules: List[ModuleInfo], project_name: str = "Project") -> None:
@@ -48,8 +49,13 @@ class MarkdownGenerator:
 - **模块数量**: {len(modules)}
 - **函数数量**: {total_functions}
 - **类数量**: {total_classes}
-- **生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
+"""
+        
+        generation_time = format_build_time(self.reproducible)
+        if generation_time:
+            overview_content += f"- **生成时间**: {generation_time}\n"
+        
+        overview_content += """
 ### 📁 模块列表
 
 """
@@ -105,10 +111,12 @@ class MarkdownGenerator:
             for cls in module.classes:
                 content += self._format_class(cls)
         
-        content += f"""
+        generation_time = format_build_time(self.reproducible)
+        if generation_time:
+            content += f"""
 
 ---
-*生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*生成时间: {generation_time}*
 """
         
         module_file = self.output_path / f"{module.name}.md"
@@ -288,10 +296,12 @@ class {cls.name}{f'({", ".join(cls.bases)})' if cls.bases else ''}:
                 index_content += f"- {icon} [{item_name}](./{module_name}.md#{item_name.lower()}) ({module_name})\n"
             index_content += "\n"
         
-        index_content += f"""
+        generation_time = format_build_time(self.reproducible)
+        if generation_time:
+            index_content += f"""
 
 ---
-*最后更新: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*最后更新: {generation_time}*
 """
         
         index_file = self.output_path / "index.md"
@@ -3,40 +3,110 @@ Python代码解析器 - 支持多种注释格式解析
 """
 
 import ast
+import codecs
+import hashlib
 import inspect
+import mmap
+import os
 import re
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
-@dataclass
+# 符号记录使用 __slots__ 以减少每个实例的内存（Python 3.10+ 才支持 dataclass 的 slots 参数）
+_RECORD_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """驻留重复出现的短字符串（类型注解、分类等）"""
+    return sys.intern(value) if value else value
+
+@dataclass(**_RECORD_OPTIONS)
+class ParameterInfo:
+    """参数信息
+    
+    同时支持属性访问和字典式访问（param['name']、param.get('type')），
+    与此前的参数字典保持兼容。
+    """
+    name: str
+    type: Optional[str] = None
+    default: Optional[str] = None
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+@dataclass(**_RECORD_OPTIONS)
 class FunctionInfo:
     """函数信息"""
     name: str
     docstring: str
     signature: str
-    parameters: List[Dict[str, Any]]
+    parameters: List[ParameterInfo]
     return_type: Optional[str]
-    source_code: str
     line_number: int
+    end_line_number: int
     category: Optional[str] = None
     priority: int = 0
     comment_marked: bool = False  # 是否通过注释标记
+    source_file: Optional[str] = None  # 源文件路径，源代码在使用时才读取
+    source_hash: Optional[str] = None  # 解析时源文件的内容哈希，读取源代码时据此校验
+    
+    @property
+    def source_code(self) -> str:
+        """源代码（按行号范围从源文件按需读取）"""
+        return source_loader.get_source(self.source_file, self.line_number, self.end_line_number,
+                                        self.source_hash)
+    
+    @property
+    def source_line_count(self) -> int:
+        """源代码行数（不读取源文件）"""
+        return self.end_line_number - self.line_number + 1 if self.source_file else 0
+    
+    def source_head(self, max_lines: int) -> str:
+        """源代码的前 max_lines 行（只读取这些行）"""
+        end_line = min(self.end_line_number, self.line_number + max_lines - 1)
+        return source_loader.get_source(self.source_file, self.line_number, end_line, self.source_hash)
 
-@dataclass
+@dataclass(**_RECORD_OPTIONS)
 class ClassInfo:
     """类信息"""
     name: str
     docstring: str
     bases: List[str]
     methods: List[FunctionInfo]
-    source_code: str
     line_number: int
+    end_line_number: int
     category: Optional[str] = None
     priority: int = 0
     comment_marked: bool = False  # 是否通过注释标记
+    source_file: Optional[str] = None  # 源文件路径，源代码在使用时才读取
+    source_hash: Optional[str] = None  # 解析时源文件的内容哈希，读取源代码时据此校验
+    
+    @property
+    def source_code(self) -> str:
+        """源代码（按行号范围从源文件按需读取）"""
+        return source_loader.get_source(self.source_file, self.line_number, self.end_line_number,
+                                        self.source_hash)
+    
+    @property
+    def source_line_count(self) -> int:
+        """源代码行数（不读取源文件）"""
+        return self.end_line_number - self.line_number + 1 if self.source_file else 0
+    
+    def source_head(self, max_lines: int) -> str:
+        """源代码的前 max_lines 行（只读取这些行）"""
+        end_line = min(self.end_line_number, self.line_number + max_lines - 1)
+        return source_loader.get_source(self.source_file, self.line_number, end_line, self.source_hash)
 
-@dataclass
+@dataclass(**_RECORD_OPTIONS)
 class ModuleInfo:
     """模块信息"""
     name: str
@@ -44,6 +114,125 @@ class ModuleInfo:
     functions: List[FunctionInfo]
     classes: List[ClassInfo]
     imports: List[str]
+    file_path: Optional[str] = None
+    source_hash: Optional[str] = None  # 解析时源文件的内容哈希
+
+class StaleSourceError(Exception):
+    """源文件在解析之后发生了变化，记录的行号范围已不对应当前内容"""
+
+def hash_source(data: bytes) -> str:
+    """源文件内容哈希（与解析缓存使用的哈希相同）"""
+    return hashlib.sha256(data).hexdigest()
+
+def decode_source(data: bytes) -> str:
+    """按UTF-8解码源文件并统一换行符（与文本模式读取的结果相同）"""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+class SourceLines:
+    """源代码行表 - 每个文件只构建一次，供所有提取步骤共享
+    
+    行偏移在首次使用时计算，按行拆分的列表也只在需要时才生成，
+    避免每个函数和类都重新拆分整个文件。
+    """
+    
+    def __init__(self, content: str):
+        self.content = content
+        self._offsets: Optional[List[int]] = None
+        self._lines: Optional[List[str]] = None
+    
+    @property
+    def offsets(self) -> List[int]:
+        """每一行起始位置在内容中的偏移"""
+        if self._offsets is None:
+            offsets = [0]
+            find = self.content.find
+            pos = find('\n')
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = find('\n', pos + 1)
+            self._offsets = offsets
+        return self._offsets
+    
+    @property
+    def lines(self) -> List[str]:
+        """按行拆分的源代码"""
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+    
+    def segment(self, start_line: int, end_line: int) -> str:
+        """获取 [start_line, end_line) 范围内的源代码（0索引），等价于按行切片后再拼接"""
+        offsets = self.offsets
+        count = len(offsets)
+        start_line = max(start_line, 0)
+        if start_line >= count or end_line <= start_line:
+            return ""
+        start = offsets[start_line]
+        if end_line >= count:
+            return self.content[start:]
+        return self.content[start:offsets[end_line] - 1]
+
+class SourceLoader:
+    """源代码加载器 - 按需读取符号的源代码
+    
+    FunctionInfo 和 ClassInfo 只记录源文件、行号范围和解析时的内容哈希，渲染模板时
+    才通过加载器读取源代码。加载器保留最近使用的少量文件，文件的 mtime 或大小变化后
+    重新读取；读取到的内容与解析时不同时抛出 StaleSourceError，由调用方重新解析，
+    避免页面中的符号与源代码来自不同版本的文件。
+    """
+    
+    def __init__(self, max_files: int = 8):
+        self.max_files = max_files
+        self._files: "OrderedDict[str, Tuple[Tuple[int, int], str, SourceLines]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_source(self, file_path: Optional[str], start_line: int, end_line: int,
+                   source_hash: Optional[str] = None) -> str:
+        """获取 [start_line, end_line] 范围内的源代码（1索引，包含两端）
+        
+        Raises:
+            StaleSourceError: 指定了 source_hash 且文件内容已与之不同
+        """
+        if not file_path:
+            return ""
+        try:
+            content_hash, source = self._get_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            return ""
+        if source_hash is not None and content_hash != source_hash:
+            raise StaleSourceError(f"源文件在解析之后已修改: {file_path}")
+        return source.segment(start_line - 1, end_line)
+    
+    def _get_file(self, file_path: str) -> Tuple[str, SourceLines]:
+        """获取文件的内容哈希和行表，必要时重新读取"""
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            cached = self._files.get(file_path)
+            if cached is not None and cached[0] == signature:
+                self._files.move_to_end(file_path)
+                return cached[1], cached[2]
+        
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        content_hash = hash_source(data)
+        source = SourceLines(decode_source(data))
+        
+        with self._lock:
+            self._files[file_path] = (signature, content_hash, source)
+            self._files.move_to_end(file_path)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return content_hash, source
+    
+    def clear(self) -> None:
+        """清空已加载的文件"""
+        with self._lock:
+            self._files.clear()
+
+# 全局源代码加载器
+source_loader = SourceLoader()
 
 class DocstringParser:
     """文档字符串解析器"""
@@ -230,7 +419,7 @@ class CommentParser:
         r'@doc_public',    # @doc_public
     ]
     
-    # 带参数的标记模式
+    # 带参数的标记模式（多个标记同时出现时按此顺序取第一个匹配的参数）
     PARAM_MARKERS = [
         r'@doc\s*\(([^)]*)\)',           # @doc(description="xxx", category="xxx", priority=1)
         r'@doc_util\s*\(([^)]*)\)',      # @doc_util(description="xxx", category="xxx", priority=1)
@@ -239,6 +428,25 @@ class CommentParser:
         r'@doc_public\s*\(([^)]*)\)',    # @doc_public(description="xxx", category="xxx", priority=1)
     ]
     
+    # 单次扫描匹配任意标记及其参数列表，等价于逐个尝试上面的模式：
+    # - word: 标记前紧跟单词字符（对应简单标记模式开头的 \b）
+    # - boundary: 标记名后是单词边界（对应简单标记模式结尾的 \b）
+    # - params: 标记后的括号参数（对应带参数的标记模式）
+    # 每个标记名是一个命名分组（分组名即标记名），不区分大小写时 Unicode 大小写折叠
+    # 匹配到的拼写（如 "doc_utıl"）也能据分组确定是哪个标记
+    MARKER_PATTERN = re.compile(
+        r'@(?P<word>(?<=\w@))?(?P<marker>'
+        + '|'.join(f'(?P<{m[1:]}>{m[1:]})' for m in sorted(MARKERS, key=len, reverse=True))
+        + r')(?P<boundary>\b)?(?:\s*\((?P<params>[^)]*)\))?',
+        re.IGNORECASE
+    )
+    
+    # 标记参数 key="value"
+    PARAM_PATTERN = re.compile(r'(\w+)\s*=\s*["\']([^"\']*)["\']')
+    
+    # 带参数标记的优先级（按优先级排列的 (分组名, 优先级)）
+    _MARKER_RANKS = tuple((m[1:], rank) for rank, m in enumerate(MARKERS))
+    
     @classmethod
     def parse_comment_markers(cls, comment: str) -> Dict[str, Any]:
         """
@@ -253,31 +461,7 @@ class CommentParser:
         if not comment:
             return {}
         
-        comment = comment.strip()
-        result = {
-            'marked': False,
-            'description': None,
-            'category': None,
-            'priority': 0
-        }
-        
-        # 检查简单标记
-        for marker in cls.MARKERS:
-            if re.search(rf'\b{marker}\b', comment, re.IGNORECASE):
-                result['marked'] = True
-                break
-        
-        # 检查带参数的标记
-        for pattern in cls.PARAM_MARKERS:
-            match = re.search(pattern, comment, re.IGNORECASE)
-            if match:
-                result['marked'] = True
-                params_str = match.group(1)
-                params = cls._parse_params(params_str)
-                result.update(params)
-                break
-        
-        return result
+        return cls._scan_markers(comment.strip())
     
     @classmethod
     def parse_docstring_markers(cls, docstring: str) -> Dict[str, Any]:
@@ -293,7 +477,11 @@ class CommentParser:
         if not docstring:
             return {}
         
-        docstring = docstring.strip()
+        return cls._scan_markers(docstring.strip())
+    
+    @classmethod
+    def _scan_markers(cls, text: str) -> Dict[str, Any]:
+        """扫描文本中的所有标记"""
         result = {
             'marked': False,
             'description': None,
@@ -301,21 +489,34 @@ class CommentParser:
             'priority': 0
         }
         
-        # 检查简单标记
-        for marker in cls.MARKERS:
-            if re.search(rf'\b{marker}\b', docstring, re.IGNORECASE):
-                result['marked'] = True
-                break
+        if '@' not in text:
+            return result
         
-        # 检查带参数的标记
-        for pattern in cls.PARAM_MARKERS:
-            match = re.search(pattern, docstring, re.IGNORECASE)
-            if match:
+        best_rank = None
+        best_params = None
+        search = cls.MARKER_PATTERN.search
+        match = search(text)
+        while match:
+            # 简单标记
+            if match.group('word') is not None and match.group('boundary') is not None:
                 result['marked'] = True
-                params_str = match.group(1)
-                params = cls._parse_params(params_str)
-                result.update(params)
-                break
+            
+            # 带参数的标记，按优先级保留第一个匹配
+            params_str = match.group('params')
+            if params_str is not None:
+                rank = next(rank for name, rank in cls._MARKER_RANKS if match.group(name) is not None)
+                if best_rank is None or rank < best_rank:
+                    best_rank = rank
+                    best_params = params_str
+                    if rank == 0:
+                        break
+            
+            # 从标记名之后继续扫描，参数中嵌套的标记也能被找到
+            match = search(text, match.end('marker'))
+        
+        if best_params is not None:
+            result['marked'] = True
+            result.update(cls._parse_params(best_params))
         
         return result
     
@@ -325,8 +526,7 @@ class CommentParser:
         params = {}
         
         # 匹配 key=value 格式的参数
-        param_pattern = r'(\w+)\s*=\s*["\']([^"\']*)["\']'
-        matches = re.findall(param_pattern, params_str)
+        matches = cls.PARAM_PATTERN.findall(params_str)
         
         for key, value in matches:
             if key == 'priority':
@@ -342,16 +542,67 @@ class CommentParser:
 class PythonParser:
     """Python代码解析器"""
     
-    def __init__(self, include_all: bool = False, enable_comment_markers: bool = True):
+    # 预扫描使用的标记前缀（与 CommentParser.MARKER_PATTERN 一样不区分大小写）
+    PREFILTER_PATTERN = re.compile(rb'@[dD][oO][cC]')
+    
+    # 超过该大小的文件使用mmap预扫描
+    PREFILTER_MMAP_THRESHOLD = 1024 * 1024
+    
+    def __init__(self, include_all: bool = False, enable_comment_markers: bool = True,
+                 include_source: bool = True):
         self.include_all = include_all
         self.enable_comment_markers = enable_comment_markers
+        # 不输出源代码时记录中不保存源文件路径，源代码永远不会被读取
+        self.include_source = include_source
         self.docstring_parser = DocstringParser()
         self.comment_parser = CommentParser()
     
+    @property
+    def can_prefilter(self) -> bool:
+        """是否只包含注释标记的符号（此时没有标记的文件可以直接跳过）"""
+        return not self.include_all and self.enable_comment_markers
+    
+    def may_contain_symbols(self, file_path: Path) -> bool:
+        """快速预扫描原始字节，判断文件是否可能包含需要文档化的符号
+        
+        只有在 can_prefilter 为真时才会排除文件：此时只有带 @doc 系列标记的
+        函数和类会被包含，文件中不出现 "@doc" 就不可能产生任何文档。
+        
+        不是有效UTF-8的文件不排除，仍由 parse_file 报告解码错误；被排除的文件不会
+        经过 ast.parse，其中的语法错误不再报告。
+        """
+        if not self.can_prefilter:
+            return True
+        
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return False
+            if size >= self.PREFILTER_MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return (self.PREFILTER_PATTERN.search(mapped) is not None
+                            or not self._is_utf8(mapped, size))
+            data = f.read()
+            return self.PREFILTER_PATTERN.search(data) is not None or not self._is_utf8(data, size)
+    
+    @classmethod
+    def _is_utf8(cls, data: Any, size: int) -> bool:
+        """分块检查字节内容是否为有效的UTF-8（支持mmap，不复制整个文件）"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for start in range(0, size, cls.PREFILTER_MMAP_THRESHOLD):
+                decoder.decode(data[start:start + cls.PREFILTER_MMAP_THRESHOLD])
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+        return True
+    
     def parse_file(self, file_path: Path) -> ModuleInfo:
         """解析Python文件"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        content = decode_source(data)
+        source_hash = hash_source(data)
         
         try:
             tree = ast.parse(content)
@@ -362,25 +613,33 @@ class PythonParser:
                 docstring="",
                 functions=[],
                 classes=[],
-                imports=[]
+                imports=[],
+                file_path=os.path.abspath(file_path),
+                source_hash=source_hash
             )
         
-        return self._parse_ast_tree(tree, file_path, content)
+        return self._parse_ast_tree(tree, file_path, SourceLines(content), source_hash)
     
-    def _parse_ast_tree(self, tree: ast.AST, file_path: Path, content: str) -> ModuleInfo:
+    def _parse_ast_tree(self, tree: ast.AST, file_path: Path, source: SourceLines,
+                        source_hash: Optional[str] = None) -> ModuleInfo:
         """解析AST树"""
         module_info = ModuleInfo(
             name=file_path.stem,
             docstring="",
             functions=[],
             classes=[],
-            imports=[]
+            imports=[],
+            file_path=os.path.abspath(file_path),
+            source_hash=source_hash
         )
         
         # 获取模块文档字符串
         if tree.body and isinstance(tree.body[0], ast.Expr) and isinstance(tree.body[0].value, ast.Str):
             module_info.docstring = tree.body[0].value.s
         
+        source_file = module_info.file_path if self.include_source else None
+        source_hash = source_hash if source_file else None
+        
         for node in tree.body:
             if isinstance(node, ast.Import):
                 for alias in node.names:
@@ -390,32 +649,29 @@ class PythonParser:
                 for alias in node.names:
                     module_info.imports.append(f"{module_name}.{alias.name}")
             elif isinstance(node, ast.FunctionDef):
-                func_info = self._parse_function(node, content)
+                func_info = self._parse_function(node, source, source_file, source_hash)
                 if self._should_include(func_info):
                     module_info.functions.append(func_info)
             elif isinstance(node, ast.ClassDef):
-                class_info = self._parse_class(node, content)
+                class_info = self._parse_class(node, source, source_file, source_hash)
                 if self._should_include(class_info):
                     module_info.classes.append(class_info)
         
         return module_info
     
-    def _parse_function(self, node: ast.FunctionDef, content: str) -> FunctionInfo:
+    def _parse_function(self, node: ast.FunctionDef, source: SourceLines, source_file: Optional[str],
+                        source_hash: Optional[str] = None) -> FunctionInfo:
         """解析函数定义"""
-        # 获取源代码
-        source_lines = content.split('\n')
-        start_line = node.lineno - 1
-        end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line + 1
-        source_code = '\n'.join(source_lines[start_line:end_line])
+        # 源代码只记录行号范围
+        end_line = node.end_lineno if hasattr(node, 'end_lineno') else node.lineno
         
         # 解析参数
         parameters = []
         for arg in node.args.args:
-            param_info = {
-                'name': arg.arg,
-                'type': self._get_type_annotation(arg.annotation),
-                'default': None
-            }
+            param_info = ParameterInfo(
+                name=_intern(arg.arg),
+                type=self._get_type_annotation(arg.annotation)
+            )
             parameters.append(param_info)
         
         # 处理默认值
@@ -424,9 +680,9 @@ class PythonParser:
             param_index = len(parameters) - len(defaults) + i
             if param_index < len(parameters):
                 try:
-                    parameters[param_index]['default'] = ast.unparse(default)
+                    parameters[param_index].default = _intern(ast.unparse(default))
                 except AttributeError:
-                    parameters[param_index]['default'] = self._ast_to_string(default)
+                    parameters[param_index].default = _intern(self._ast_to_string(default))
         
         # 获取返回类型
         return_type = self._get_type_annotation(node.returns)
@@ -448,7 +704,7 @@ class PythonParser:
         
         # 检查注释标记（函数上方的注释）
         if self.enable_comment_markers:
-            comment_info = self._get_comment_info(node, source_lines)
+            comment_info = self._get_comment_info(node, source.lines)
             if comment_info['marked']:
                 comment_marked = True
                 category = comment_info.get('category', category)
@@ -468,37 +724,37 @@ class PythonParser:
             signature=self._get_function_signature(node),
             parameters=parameters,
             return_type=return_type,
-            source_code=source_code,
             line_number=node.lineno,
-            category=category,
+            end_line_number=end_line,
+            category=_intern(category),
             priority=priority,
-            comment_marked=comment_marked
+            comment_marked=comment_marked,
+            source_file=source_file,
+            source_hash=source_hash
         )
     
-    def _parse_class(self, node: ast.ClassDef, content: str) -> ClassInfo:
+    def _parse_class(self, node: ast.ClassDef, source: SourceLines, source_file: Optional[str],
+                     source_hash: Optional[str] = None) -> ClassInfo:
         """解析类定义"""
-        # 获取源代码
-        source_lines = content.split('\n')
-        start_line = node.lineno - 1
-        end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line + 1
-        source_code = '\n'.join(source_lines[start_line:end_line])
+        # 源代码只记录行号范围
+        end_line = node.end_lineno if hasattr(node, 'end_lineno') else node.lineno
         
         # 解析基类
         bases = []
         for base in node.bases:
             if isinstance(base, ast.Name):
-                bases.append(base.id)
+                bases.append(_intern(base.id))
             elif isinstance(base, ast.Attribute):
                 try:
-                    bases.append(ast.unparse(base))
+                    bases.append(_intern(ast.unparse(base)))
                 except AttributeError:
-                    bases.append(self._ast_to_string(base))
+                    bases.append(_intern(self._ast_to_string(base)))
         
         # 解析方法
         methods = []
         for item in node.body:
             if isinstance(item, ast.FunctionDef):
-                method_info = self._parse_function(item, content)
+                method_info = self._parse_function(item, source, source_file, source_hash)
                 if self._should_include(method_info):
                     methods.append(method_info)
         
@@ -512,7 +768,7 @@ class PythonParser:
         
         # 检查类上方的注释标记
         if self.enable_comment_markers:
-            comment_info = self._get_comment_info(node, source_lines)
+            comment_info = self._get_comment_info(node, source.lines)
             if comment_info['marked']:
                 comment_marked = True
                 category = comment_info.get('category', category)
@@ -531,11 +787,13 @@ class PythonParser:
             docstring=docstring,
             bases=bases,
             methods=methods,
-            source_code=source_code,
             line_number=node.lineno,
-            category=category,
+            end_line_number=end_line,
+            category=_intern(category),
             priority=priority,
-            comment_marked=comment_marked
+            comment_marked=comment_marked,
+            source_file=source_file,
+            source_hash=source_hash
         )
     
     def _get_comment_info(self, node: ast.AST, source_lines: List[str]) -> Dict[str, Any]:
@@ -575,10 +833,10 @@ class PythonParser:
         if annotation is None:
             return None
         try:
-            return ast.unparse(annotation)
+            return _intern(ast.unparse(annotation))
         except AttributeError:
             # Python 3.8 兼容性
-            return self._ast_to_string(annotation)
+            return _intern(self._ast_to_string(annotation))
     
     def _ast_to_string(self, node) -> str:
         """将AST节点转换为字符串（Python 3.8兼容）"""
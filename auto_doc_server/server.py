@@ -0,0 +1,381 @@
+"""
+内置文档服务器 - 不依赖Node.js和VitePress，直接将生成的Markdown渲染为HTML
+
+渲染结果按Markdown内容哈希缓存在有字节上限的LRU中，同一页面的并发请求只渲染一次；
+支持 ETag/If-None-Match 和 gzip。
+"""
+
+import gzip
+import hashlib
+import html
+import mimetypes
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+import markdown
+
+from .livereload import SCRIPT_PATH
+
+# 渲染方式变化时修改版本号，使旧的ETag失效
+RENDER_VERSION = "1"
+
+# 小于该大小的响应不压缩
+GZIP_MIN_SIZE = 1024
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ max-width: 960px; margin: 0 auto; padding: 24px; font-family: -apple-system, "Segoe UI", "PingFang SC", "Microsoft YaHei", sans-serif; line-height: 1.6; color: #213547; }}
+nav {{ margin-bottom: 16px; }}
+a {{ color: #3451b2; text-decoration: none; }}
+a:hover {{ text-decoration: underline; }}
+pre {{ background: #f6f8fa; padding: 12px; overflow-x: auto; border-radius: 6px; }}
+code {{ font-family: Menlo, Consolas, monospace; font-size: 0.9em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #d0d7de; padding: 4px 10px; }}
+details {{ margin: 8px 0; }}
+.toc {{ background: #f6f8fa; padding: 8px 16px; border-radius: 6px; }}
+</style>
+{head}</head>
+<body>
+<nav><a href="/">文档首页</a> · <a href="/overview.md">项目概览</a></nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+_TITLE_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+
+def _preprocess(text: str) -> str:
+    """将VitePress风格的Markdown调整为Python-Markdown可以处理的形式
+
+    - `::: details 标题` 折叠容器转换为HTML details元素（内部仍按Markdown渲染）
+    - 紧跟在段落后的表格前补一个空行（Python-Markdown要求表格单独成块）
+    代码块中的内容保持不变。
+    """
+    lines = []
+    in_fence = False
+    previous = ""
+    for line in text.split('\n'):
+        if line.startswith('```'):
+            in_fence = not in_fence
+        elif not in_fence:
+            if line.startswith('::: details'):
+                summary = html.escape(line[len('::: details'):].strip() or "详情")
+                lines.extend(['<details markdown="1">', f'<summary>{summary}</summary>', ''])
+                previous = ""
+                continue
+            if line.strip() == ':::':
+                lines.extend(['', '</details>'])
+                previous = '</details>'
+                continue
+            if line.startswith('|') and previous.strip() and not previous.startswith('|'):
+                lines.append('')
+        lines.append(line)
+        previous = line
+    return '\n'.join(lines)
+
+def render_markdown(text: str, head: str = "") -> str:
+    """将生成的Markdown页面渲染为完整的HTML页面，head 为插入 <head> 的额外内容"""
+    title_match = _TITLE_PATTERN.search(text)
+    title = title_match.group(1).strip() if title_match else "文档"
+
+    # Markdown实例不是线程安全的，每次渲染单独创建
+    converter = markdown.Markdown(
+        extensions=['fenced_code', 'tables', 'toc', 'md_in_html'],
+        extension_configs={'toc': {'marker': '[[toc]]'}}
+    )
+    body = converter.convert(_preprocess(text))
+    return PAGE_TEMPLATE.format(title=html.escape(title), head=head, body=body)
+
+@dataclass
+class RenderedPage:
+    """缓存的渲染结果"""
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+def build_page(markdown_text: str, digest: str, head: str = "") -> RenderedPage:
+    """将Markdown渲染为HTML页面并预先压缩，digest 为页面来源内容的哈希"""
+    if head:
+        # 额外内容不同的页面不能共用ETag
+        digest = hashlib.sha256(f"{digest}\n{head}".encode('utf-8')).hexdigest()
+    body = render_markdown(markdown_text, head).encode('utf-8')
+    gzip_body = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+    return RenderedPage(body=body, gzip_body=gzip_body, etag=f'"{digest[:32]}-{RENDER_VERSION}"')
+
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+
+class PageCache:
+    """按内容哈希缓存渲染结果的LRU，总大小不超过 max_bytes
+
+    同一个键的并发请求只有第一个会执行渲染，其余等待其结果（single-flight）。
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._pages: "OrderedDict[str, RenderedPage]" = OrderedDict()
+        self._size = 0
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+
+    def get_or_render(self, key: str, render: Callable[[], RenderedPage]) -> RenderedPage:
+        """获取缓存的页面，不存在时渲染（并发请求共享同一次渲染）"""
+        while True:
+            with self._lock:
+                page = self._pages.get(key)
+                if page is not None:
+                    self._pages.move_to_end(key)
+                    self.hits += 1
+                    return page
+                event = self._inflight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    self.misses += 1
+                    break
+            # 其他线程正在渲染，等待完成后重新查找（渲染失败时由本线程重试）
+            event.wait()
+
+        try:
+            page = render()
+            with self._lock:
+                self.renders += 1
+                self._store(key, page)
+            return page
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def _store(self, key: str, page: RenderedPage) -> None:
+        """保存页面并淘汰最久未使用的页面（调用方持有锁）"""
+        if page.size > self.max_bytes:
+            return
+        self._pages[key] = page
+        self._size += page.size
+        while self._size > self.max_bytes:
+            _, evicted = self._pages.popitem(last=False)
+            self._size -= evicted.size
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计"""
+        with self._lock:
+            return {
+                'pages': len(self._pages),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'renders': self.renders
+            }
+
+class _DocsHTTPServer(ThreadingHTTPServer):
+    """每个连接一个线程的HTTP服务器"""
+    daemon_threads = True
+    request_queue_size = 128
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 请求头是否匹配当前ETag"""
+    if not header:
+        return False
+    candidates = [item.strip() for item in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+class DocsServer:
+    """生成文档的HTTP服务器
+
+    `/` 对应 index.md，`/<name>.md`（或 `/<name>`、`/<name>.html`）对应渲染后的页面，
+    输出目录中的其他文件（stats.json、doc-ir.ndjson等）按原样返回。
+    """
+
+    def __init__(self, docs_path: Union[str, Path], host: str = "localhost", port: int = 3000,
+                 cache_bytes: int = 64 * 1024 * 1024, verbose: bool = False,
+                 livereload_url: Optional[str] = None):
+        self.docs_path = Path(docs_path).resolve()
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.cache = PageCache(cache_bytes)
+
+        # 指定监听进程的实时刷新地址后，页面中加入客户端脚本
+        self.page_head = ""
+        if livereload_url:
+            self.page_head = f'<script src="{html.escape(livereload_url.rstrip("/"))}{SCRIPT_PATH}"></script>\n'
+
+        # 文件内容哈希（stat 签名不变时不重新读取文件）
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._hash_lock = threading.Lock()
+
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    def resolve(self, url_path: str) -> Optional[Path]:
+        """将请求路径映射为输出目录中的文件，不存在或越出输出目录时返回None"""
+        relative = unquote(url_path).lstrip('/')
+        if not relative or relative.endswith('/'):
+            relative += "index.md"
+        elif relative.endswith('.html'):
+            relative = relative[:-len('.html')] + ".md"
+
+        candidate = (self.docs_path / relative).resolve()
+        if not candidate.is_file() and not candidate.suffix:
+            candidate = candidate.with_suffix(".md")
+
+        try:
+            candidate.relative_to(self.docs_path)
+        except ValueError:
+            return None
+        if any(part.startswith('.') for part in candidate.relative_to(self.docs_path).parts):
+            return None
+        return candidate if candidate.is_file() else None
+
+    def file_hash(self, path: Path) -> Tuple[str, bytes]:
+        """返回文件内容哈希和内容（stat 签名未变化时内容为空，调用方需要时再读取）"""
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = str(path)
+        with self._hash_lock:
+            cached = self._hashes.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1], b""
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._hash_lock:
+            self._hashes[key] = (signature, digest)
+        return digest, data
+
+    def render_page(self, path: Path) -> RenderedPage:
+        """获取Markdown页面的渲染结果（按内容哈希缓存）"""
+        digest, data = self.file_hash(path)
+
+        def render() -> RenderedPage:
+            return build_page((data or path.read_bytes()).decode('utf-8'), digest, self.page_head)
+
+        return self.cache.get_or_render(digest, render)
+
+    def get_response(self, url_path: str) -> Optional[Tuple[RenderedPage, str]]:
+        """获取请求路径对应的响应内容和类型，不存在时返回None"""
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        if path.suffix == ".md":
+            return self.render_page(path), HTML_CONTENT_TYPE
+
+        data = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or path.suffix in (".json", ".ndjson"):
+            content_type += "; charset=utf-8"
+        etag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+        return RenderedPage(data, None, etag), content_type
+
+    def banner(self) -> str:
+        """启动时输出的说明"""
+        return f"🌐 内置文档服务器: http://{self.host}:{self.port} (文档目录: {self.docs_path})"
+
+    def make_handler(self) -> type:
+        """创建绑定到本服务器的请求处理类"""
+        server = self
+
+        class DocsRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._handle(send_body=True)
+
+            def do_HEAD(self):
+                self._handle(send_body=False)
+
+            def _handle(self, send_body: bool) -> None:
+                try:
+                    response = server.get_response(urlsplit(self.path).path)
+                except Exception as e:
+                    self._send_plain(HTTPStatus.INTERNAL_SERVER_ERROR, f"500 渲染失败: {e}", send_body)
+                    return
+
+                if response is None:
+                    self._send_plain(HTTPStatus.NOT_FOUND, "404 Not Found", send_body)
+                    return
+                page, content_type = response
+                self._send_page(page, content_type, send_body)
+
+            def _send_page(self, page: RenderedPage, content_type: str, send_body: bool) -> None:
+                if _etag_matches(self.headers.get("If-None-Match"), page.etag):
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header("ETag", page.etag)
+                    self.end_headers()
+                    return
+
+                body = page.body
+                use_gzip = page.gzip_body is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+                if use_gzip:
+                    body = page.gzip_body
+
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", page.etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Vary", "Accept-Encoding")
+                if use_gzip:
+                    self.send_header("Content-Encoding", "gzip")
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def _send_plain(self, status: HTTPStatus, message: str, send_body: bool) -> None:
+                body = message.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                if server.verbose:
+                    super().log_message(format, *args)
+
+        return DocsRequestHandler
+
+    def start(self) -> ThreadingHTTPServer:
+        """创建并绑定HTTP服务器（不阻塞）"""
+        self.httpd = _DocsHTTPServer((self.host, self.port), self.make_handler())
+        self.port = self.httpd.server_address[1]
+        return self.httpd
+
+    def serve_forever(self) -> None:
+        """启动服务器并阻塞直到中断"""
+        if self.httpd is None:
+            self.start()
+        print(self.banner())
+        print("按 Ctrl+C 停止服务器")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self) -> None:
+        """停止服务器"""
+        if self.httpd is not None:
+            self.httpd.shutdown()
@@ -0,0 +1,137 @@
+"""
+模板缓存 - Jinja2字节码缓存和预编译模板
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import jinja2
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    TemplateNotFound,
+)
+
+# 预编译模板目录中记录模板源码哈希的清单
+PRECOMPILED_MANIFEST = "templates.json"
+
+# 渲染和预编译共用的环境选项（空白处理在编译时确定，两者必须一致）
+ENVIRONMENT_OPTIONS = {
+    'trim_blocks': True,
+    'lstrip_blocks': True,
+}
+
+def _source_hashes(template_dir: Path) -> Dict[str, str]:
+    """计算模板目录中各模板源码的哈希"""
+    hashes = {}
+    for path in sorted(template_dir.rglob('*.j2')):
+        name = path.relative_to(template_dir).as_posix()
+        hashes[name] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return hashes
+
+def _precompiled_loader(template_dir: Path, precompiled_dir: Path) -> Optional[BaseLoader]:
+    """预编译模板与模板源码一致时返回加载器，否则返回None"""
+    try:
+        with open(precompiled_dir / PRECOMPILED_MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"警告: 无法读取预编译模板 {precompiled_dir}: {e}")
+        return None
+
+    if manifest.get('jinja2') != jinja2.__version__:
+        print(f"警告: 预编译模板的Jinja2版本不一致，已忽略: {precompiled_dir}")
+        return None
+    if manifest.get('templates') != _source_hashes(template_dir):
+        print(f"警告: 预编译模板已过期，请重新运行 compile-templates: {precompiled_dir}")
+        return None
+
+    return ModuleLoader(str(precompiled_dir))
+
+class PrecompiledChoiceLoader(BaseLoader):
+    """优先使用预编译模板的加载器
+
+    预编译模板只在加载时校验一次源码哈希，之后不会感知模板文件的修改。
+    环境开启 auto_reload（监听模式、守护进程）时直接从模板源码加载，
+    使模板修改能够生效；批量生成时使用预编译模板。
+    """
+
+    def __init__(self, precompiled: BaseLoader, source: BaseLoader):
+        self.precompiled = precompiled
+        self.source = source
+
+    def load(self, environment: Environment, name: str, globals=None):
+        if not environment.auto_reload:
+            try:
+                return self.precompiled.load(environment, name, globals)
+            except TemplateNotFound:
+                pass
+        return self.source.load(environment, name, globals)
+
+    def list_templates(self):
+        return self.source.list_templates()
+
+def create_environment(
+    template_dir: Union[str, Path],
+    bytecode_cache_dir: Optional[Union[str, Path]] = None,
+    precompiled_dir: Optional[Union[str, Path]] = None,
+    auto_reload: bool = True
+) -> Environment:
+    """创建模板环境
+
+    Args:
+        template_dir: 模板目录
+        bytecode_cache_dir: 字节码缓存目录，指定后编译结果在进程之间复用
+        precompiled_dir: compile_templates 生成的预编译模板目录，与模板源码一致且
+            未开启 auto_reload 时优先使用
+        auto_reload: 每次获取模板时检查源文件是否变化（批量生成时可关闭）
+    """
+    template_dir = Path(template_dir)
+    loader: BaseLoader = FileSystemLoader(str(template_dir))
+
+    if precompiled_dir:
+        module_loader = _precompiled_loader(template_dir, Path(precompiled_dir))
+        if module_loader is not None:
+            loader = PrecompiledChoiceLoader(module_loader, loader)
+
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        bytecode_cache_dir = Path(bytecode_cache_dir)
+        try:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        except OSError as e:
+            print(f"警告: 无法创建模板缓存目录 {bytecode_cache_dir}: {e}")
+
+    return Environment(
+        loader=loader,
+        bytecode_cache=bytecode_cache,
+        auto_reload=auto_reload,
+        **ENVIRONMENT_OPTIONS
+    )
+
+def compile_templates(template_dir: Union[str, Path], target: Union[str, Path]) -> int:
+    """将模板预编译为Python模块，返回模板数量
+
+    目标目录中同时写入模板源码哈希清单，模板修改后预编译结果会被自动忽略。
+    """
+    template_dir = Path(template_dir)
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+
+    env = Environment(loader=FileSystemLoader(str(template_dir)), **ENVIRONMENT_OPTIONS)
+    names = env.list_templates(extensions=['j2'])
+    env.compile_templates(str(target), zip=None, ignore_errors=False)
+
+    manifest = {
+        'jinja2': jinja2.__version__,
+        'templates': _source_hashes(template_dir),
+    }
+    with open(target / PRECOMPILED_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return len(names)
@@ -4,42 +4,147 @@
 
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
-from .parser import ModuleInfo, FunctionInfo, ClassInfo
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from .parser import ModuleInfo, FunctionInfo, ClassInfo, PythonParser, StaleSourceError
+from .writer import OutputWriter, discard_temp, stream_to_temp
+from .build_time import format_build_time
+from .template_cache import create_environment
+
+# 子进程内使用的生成器（由进程池初始化函数设置）
+_worker_generator: Optional["TemplateMarkdownGenerator"] = None
+
+def _init_render_worker(options: Dict[str, Any]) -> None:
+    """进程池初始化：在每个子进程中创建一份生成器（Jinja2环境无法跨进程传递）"""
+    global _worker_generator
+    _worker_generator = TemplateMarkdownGenerator(**options)
+
+def _render_module_in_worker(task: Tuple[ModuleInfo, Dict[str, Any]]) -> Tuple[Optional[Tuple[str, int, str]], Optional[str]]:
+    """在子进程中将单个模块页面渲染到临时文件，返回 (临时文件, 错误信息)
+
+    临时文件由主进程按模块顺序提交，同名模块的页面与串行生成时一样由后面的模块决定。
+    """
+    module, config = task
+    try:
+        return _worker_generator._stream_module_doc(module, config), None
+    except Exception as e:
+        return None, str(e)
 
 class TemplateMarkdownGenerator:
     """基于Jinja2模板的Markdown文档生成器"""
     
-    def __init__(self, output_path: str = "./docs", template_dir: str = "templates"):
+    # 生成文档使用的模板
+    TEMPLATES = ('overview.j2', 'module.j2', 'index.j2')
+    
+    # 源代码输出方式：full 每个方法和类都输出完整源代码；
+    # dedupe 类源代码只输出一次，方法链接到其中的行范围
+    SOURCE_MODES = ('full', 'dedupe')
+    
+    # 源代码超过 max_source_lines 时的处理方式：truncate 只保留前面的行；
+    # collapse 完整输出在默认折叠的 details 容器中
+    SOURCE_OVERFLOW_MODES = ('truncate', 'collapse')
+    
+    def __init__(self, output_path: str = "./docs", template_dir: str = "templates",
+                 reproducible: bool = False, bytecode_cache_dir: Optional[str] = None,
+                 precompiled_dir: Optional[str] = None, auto_reload: bool = True,
+                 jobs: int = 1, source_mode: str = "full", include_source: bool = True,
+                 include_toc: bool = True, max_source_lines: int = 0,
+                 source_overflow: str = "truncate", parser: Optional[PythonParser] = None):
         self.output_path = Path(output_path)
         self.template_dir = Path(__file__).parent / template_dir
+        # 可复现模式：不输出当前时间（设置了 SOURCE_DATE_EPOCH 时使用该时间）
+        self.reproducible = reproducible
+        if source_mode not in self.SOURCE_MODES:
+            print(f"警告: 未知的源代码输出方式 {source_mode}，使用 full")
+            source_mode = "full"
+        self.source_mode = source_mode
+        if source_overflow not in self.SOURCE_OVERFLOW_MODES:
+            print(f"警告: 未知的超长源代码处理方式 {source_overflow}，使用 truncate")
+            source_overflow = "truncate"
+        self.source_overflow = source_overflow
+        self.include_source = include_source
+        self.include_toc = include_toc
+        # 单个符号最多输出的源代码行数（0表示不限制）
+        self.max_source_lines = max(0, int(max_source_lines or 0))
+        # 并行渲染模块页面的进程数
+        self.jobs = jobs
+        # 源文件在解析之后被修改时，用于重新解析模块（未指定时报告错误）
+        self.parser = parser
+        # 渲染子进程中创建生成器的参数
+        self._worker_options = {
+            "output_path": str(output_path),
+            "template_dir": template_dir,
+            "reproducible": reproducible,
+            "bytecode_cache_dir": bytecode_cache_dir,
+            "precompiled_dir": precompiled_dir,
+            "auto_reload": False,
+            "source_mode": source_mode,
+            "include_source": include_source,
+            "include_toc": include_toc,
+            "max_source_lines": self.max_source_lines,
+            "source_overflow": source_overflow,
+            "parser": parser
+        }
         
-        # 初始化Jinja2环境
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(self.template_dir),
-            trim_blocks=True,
-            lstrip_blocks=True
+        # 初始化Jinja2环境（可选字节码缓存和预编译模板）
+        self.jinja_env = create_environment(
+            self.template_dir,
+            bytecode_cache_dir=bytecode_cache_dir,
+            precompiled_dir=precompiled_dir,
+            auto_reload=auto_reload
         )
         
-        self.output_path.mkdir(parents=True, exist_ok=True)
+        # 内容未变化的文件不重写（输出目录在首次写入时创建，只渲染不写入时不会创建）
+        self.writer = OutputWriter(self.output_path)
+    
+    def load_templates(self) -> None:
+        """预先加载（编译）所有模板，便于单独统计模板编译耗时"""
+        for name in self.TEMPLATES:
+            self.jinja_env.get_template(name)
     
     def get_default_config(self) -> Dict[str, Any]:
         """获取默认配置"""
         return {
             "footer": "本文档由 Auto Doc Server 自动生成",
-            "generation_time": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            "generation_time": format_build_time(self.reproducible),
+            "source_mode": self.source_mode,
+            "include_source": self.include_source,
+            "include_toc": self.include_toc,
+            "max_source_lines": self.max_source_lines,
+            "source_overflow": self.source_overflow
         }
     
-    def generate_documentation(self, modules: List[ModuleInfo], project_name: str = "Project", 
-                             custom_config: Optional[Dict[str, Any]] = None) -> None:
-        """生成完整的文档"""
-        # 合并配置
+    def _build_config(self, custom_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """合并默认配置与自定义配置"""
         config = self.get_default_config()
         if custom_config:
             config.update(custom_config)
+        return config
+    
+    def generate_documentation(self, modules: List[ModuleInfo], project_name: str = "Project", 
+                             custom_config: Optional[Dict[str, Any]] = None) -> None:
+        """生成完整的文档
+        
+        内容未变化的文件不会重写；上次生成而本次没有再生成的页面会被删除。
+        """
+        self.writer.begin_build()
+        stats = self.generate_pages(modules, project_name, custom_config)
+        
+        # 保存统计信息
+        self._save_stats(stats)
+        
+        # 删除过期页面
+        self.writer.finish_build()
+    
+    def generate_pages(self, modules: List[ModuleInfo], project_name: str = "Project",
+                       custom_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """生成概览、模块和索引页面，返回统计信息
+        
+        不处理构建的开始和结束（由调用方调用 writer.begin_build/finish_build）。
+        """
+        # 合并配置
+        config = self._build_config(custom_config)
         
         # 计算统计信息
         stats = self._calculate_stats(modules)
@@ -48,14 +153,36 @@ class TemplateMarkdownGenerator:
         self._generate_overview(modules, project_name, stats, config)
         
         # 生成每个模块的文档
-        for module in modules:
-            self._generate_module_doc(module, config)
+        self._generate_module_docs(modules, config)
         
         # 生成索引页面
         self._generate_index(modules, project_name, config)
         
-        # 保存统计信息
-        self._save_stats(stats)
+        return stats
+    
+    def generate_module(self, module: ModuleInfo, custom_config: Optional[Dict[str, Any]] = None) -> None:
+        """只生成单个模块的文档页面（用于增量更新）"""
+        self._generate_module_doc(module, self._build_config(custom_config))
+        self.writer.save_manifest()
+    
+    def remove_module(self, module: ModuleInfo) -> None:
+        """删除已不存在模块的文档页面"""
+        module_file = self._module_file(module)
+        if self.writer.remove(module_file):
+            print(f"🗑️ 删除模块文档: {module_file}")
+        self.writer.save_manifest()
+    
+    def generate_summary(self, modules: List[ModuleInfo], project_name: str = "Project",
+                         custom_config: Optional[Dict[str, Any]] = None,
+                         save_stats: bool = True) -> None:
+        """只重新生成概览、索引和统计信息（用于增量更新）"""
+        config = self._build_config(custom_config)
+        stats = self._calculate_stats(modules)
+        self._generate_overview(modules, project_name, stats, config)
+        self._generate_index(modules, project_name, config)
+        if save_stats:
+            self._save_stats(stats)
+        self.writer.save_manifest()
     
     def _calculate_stats(self, modules: List[ModuleInfo]) -> Dict[str, Any]:
         """计算统计信息"""
@@ -86,36 +213,107 @@ class TemplateMarkdownGenerator:
             )
             
             overview_file = self.output_path / "overview.md"
-            with open(overview_file, 'w', encoding='utf-8') as f:
-                f.write(overview_content)
-                
-            print(f"✅ 生成项目概览: {overview_file}")
+            if self.writer.write_text(overview_file, overview_content):
+                print(f"✅ 生成项目概览: {overview_file}")
             
         except Exception as e:
             print(f"❌ 生成项目概览失败: {e}")
     
+    def _generate_module_docs(self, modules: List[ModuleInfo], config: Dict[str, Any]) -> None:
+        """生成所有模块的文档（串行或多进程）
+        
+        多进程时子进程将页面流式写入临时文件，主进程按模块顺序替换到目标位置，
+        输出与串行生成一致（包括同名模块）。单个模块失败不影响其他模块。
+        """
+        if self.jobs <= 1 or len(modules) <= 1:
+            for module in modules:
+                self._generate_module_doc(module, config)
+            return
+        
+        workers = min(self.jobs, len(modules))
+        chunksize = max(1, len(modules) // (workers * 4))
+        print(f"⚙️ 使用 {workers} 个进程并行渲染")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self._worker_options,)
+        ) as executor:
+            tasks = ((module, config) for module in modules)
+            rendered = executor.map(_render_module_in_worker, tasks, chunksize=chunksize)
+            for module, (staged, error) in zip(modules, rendered):
+                if error is not None:
+                    print(f"❌ 生成模块文档失败: {error}")
+                    continue
+                module_file = self._module_file(module)
+                try:
+                    changed = self.writer.commit(module_file, *staged)
+                except Exception as e:
+                    discard_temp(staged[0])
+                    print(f"❌ 生成模块文档失败: {e}")
+                    continue
+                if changed:
+                    print(f"✅ 生成模块文档: {module_file}")
+    
     def _generate_module_doc(self, module: ModuleInfo, config: Dict[str, Any]) -> None:
         """生成模块文档"""
         try:
-            # 准备模块数据
-            module_data = self._prepare_module_data(module)
-            
-            template = self.jinja_env.get_template('module.j2')
-            module_content = template.render(
-                module=module_data,
-                imports_formatted=self._format_imports(module.imports),
-                config=config
-            )
-            
-            module_file = self.output_path / f"{module.name}.md"
-            with open(module_file, 'w', encoding='utf-8') as f:
-                f.write(module_content)
-                
-            print(f"✅ 生成模块文档: {module_file}")
-            
+            if self._write_module_doc(module, config):
+                print(f"✅ 生成模块文档: {self._module_file(module)}")
         except Exception as e:
             print(f"❌ 生成模块文档失败: {e}")
     
+    def _module_file(self, module: ModuleInfo) -> Path:
+        """模块文档的路径"""
+        return self.output_path / f"{module.name}.md"
+    
+    def render_module(self, module: ModuleInfo, config: Optional[Dict[str, Any]] = None) -> str:
+        """渲染模块文档内容（不写入文件），源文件在解析之后被修改时重新解析后渲染
+        
+        Args:
+            config: 渲染配置，未指定时使用默认配置
+        """
+        try:
+            return "".join(self.iter_module(module, config))
+        except StaleSourceError:
+            return "".join(self.iter_module(self.reparse_module(module), config))
+    
+    def iter_module(self, module: ModuleInfo, config: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """逐段渲染模块文档内容（不在内存中拼接整个页面）
+        
+        源文件在解析之后被修改时，迭代过程中抛出 StaleSourceError。
+        """
+        if config is None:
+            config = self._build_config()
+        # 准备模块数据
+        module_data = self._prepare_module_data(module)
+        
+        template = self.jinja_env.get_template('module.j2')
+        return template.generate(
+            module=module_data,
+            imports_formatted=self._format_imports(module.imports),
+            config=config
+        )
+    
+    def _write_module_doc(self, module: ModuleInfo, config: Dict[str, Any]) -> bool:
+        """流式写入模块文档（内容未变化时跳过），返回是否实际写入"""
+        return self.writer.commit(self._module_file(module), *self._stream_module_doc(module, config))
+    
+    def _stream_module_doc(self, module: ModuleInfo, config: Dict[str, Any]) -> Tuple[str, int, str]:
+        """将模块文档流式写入临时文件，返回 (临时文件路径, 字节数, 内容哈希)"""
+        module_file = self._module_file(module)
+        try:
+            return stream_to_temp(module_file, self.iter_module(module, config))
+        except StaleSourceError:
+            module = self.reparse_module(module)
+            return stream_to_temp(module_file, self.iter_module(module, config))
+    
+    def reparse_module(self, module: ModuleInfo) -> ModuleInfo:
+        """源文件在解析之后被修改时重新解析模块，使页面中的符号与源代码一致"""
+        if self.parser is None or not module.file_path:
+            raise StaleSourceError(f"源文件在解析之后已修改: {module.file_path}")
+        print(f"🔄 源文件在解析之后已修改，重新解析: {module.file_path}")
+        return self.parser.parse_file(Path(module.file_path))
+    
     def _prepare_module_data(self, module: ModuleInfo) -> Dict[str, Any]:
         """准备模块数据用于模板渲染"""
         # 分离文档化和未文档化的函数
@@ -186,10 +384,8 @@ class TemplateMarkdownGenerator:
             )
             
             index_file = self.output_path / "index.md"
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(index_content)
-                
-            print(f"✅ 生成索引页面: {index_file}")
+            if self.writer.write_text(index_file, index_content):
+                print(f"✅ 生成索引页面: {index_file}")
             
         except Exception as e:
             print(f"❌ 生成索引页面失败: {e}")
@@ -198,10 +394,8 @@ class TemplateMarkdownGenerator:
         """保存统计信息"""
         try:
             stats_file = self.output_path / "stats.json"
-            with open(stats_file, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, indent=2, ensure_ascii=False)
-                
-            print(f"✅ 保存统计信息: {stats_file}")
+            if self.writer.write_text(stats_file, json.dumps(stats, indent=2, ensure_ascii=False)):
+                print(f"✅ 保存统计信息: {stats_file}")
             
         except Exception as e:
             print(f"❌ 保存统计信息失败: {e}") 
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+监听模式的变化队列 - 合并文件事件，保证同一时间只有一次生成
+
+文件事件只进入队列，由单独的生成线程在事件停止一段时间（安静期）后取出整批变化；
+生成期间到达的事件在本次生成结束后作为下一批处理一次。
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+
+@dataclass
+class ChangeBatch:
+    """一批合并后的文件变化"""
+    paths: List[str]
+    # 目录被删除或移动，需要完整重建
+    full: bool
+    events: int
+    # 最后一个事件的时间（time.time()），用于计算保存到推送的耗时
+    last_event_time: float
+    # 来自创建或移动事件的文件：移动和 cp -p 会保留原有的 mtime，必须重新处理
+    forced: Set[str] = field(default_factory=set)
+
+class ChangeQueue:
+    """合并文件变化事件的队列
+
+    Args:
+        quiet_period: 最后一个事件之后等待的时间（秒），期间没有新事件才取出整批变化
+        max_delay: 事件持续不断时，从第一个事件起最多等待的时间（秒）
+    """
+
+    def __init__(self, quiet_period: float = 0.2, max_delay: float = 5.0):
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        self._paths: Dict[str, None] = {}
+        self._forced: Set[str] = set()
+        self._full = False
+        self._events = 0
+        self._first = 0.0
+        self._last = 0.0
+        self._last_time = 0.0
+        self._closed = False
+
+    def _has_pending(self) -> bool:
+        return bool(self._paths) or self._full
+
+    def _touch(self) -> None:
+        """记录一个事件（调用方持有锁）"""
+        now = time.monotonic()
+        if not self._has_pending():
+            self._first = now
+            self._events = 0
+        self._last = now
+        self._last_time = time.time()
+        self._events += 1
+
+    def add(self, path: str, force: bool = False) -> None:
+        """加入一个变化的文件（创建、修改、删除或移动）
+
+        Args:
+            force: 无论文件状态是否与上次生成时相同都重新处理（创建和移动事件）
+        """
+        with self._cond:
+            self._touch()
+            path = os.path.abspath(path)
+            self._paths[path] = None
+            if force:
+                self._forced.add(path)
+            self._cond.notify()
+
+    def request_full(self) -> None:
+        """要求完整重建（例如目录被删除或移动）"""
+        with self._cond:
+            self._touch()
+            self._full = True
+            self._cond.notify()
+
+    @property
+    def pending(self) -> int:
+        """等待处理的文件数"""
+        with self._cond:
+            return len(self._paths)
+
+    def get(self) -> Optional[ChangeBatch]:
+        """阻塞直到有一批变化可以处理，队列关闭后返回None"""
+        with self._cond:
+            while not self._closed:
+                timeout = None
+                if self._has_pending():
+                    now = time.monotonic()
+                    ready_at = min(self._last + self.quiet_period, self._first + self.max_delay)
+                    if now >= ready_at:
+                        return self._take()
+                    timeout = ready_at - now
+                self._cond.wait(timeout)
+            return None
+
+    def _take(self) -> ChangeBatch:
+        """取出当前的全部变化（调用方持有锁）"""
+        batch = ChangeBatch(
+            paths=list(self._paths),
+            full=self._full,
+            events=self._events,
+            last_event_time=self._last_time,
+            forced=self._forced
+        )
+        self._paths = {}
+        self._forced = set()
+        self._full = False
+        self._events = 0
+        return batch
+
+    def close(self) -> None:
+        """关闭队列，唤醒等待的线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+class ChangeHandler(FileSystemEventHandler):
+    """将文件系统事件转换为队列中的变化（不在事件线程中执行生成）"""
+
+    EVENT_TYPES = ('created', 'modified', 'deleted', 'moved')
+
+    def __init__(self, queue: ChangeQueue, suffix: str = ".py"):
+        self.queue = queue
+        self.suffix = suffix
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.event_type not in self.EVENT_TYPES:
+            return
+
+        if event.is_directory:
+            # 目录被删除或移动时其中的文件不一定都有单独的事件
+            if event.event_type in ('deleted', 'moved'):
+                self.queue.request_full()
+            return
+
+        force = event.event_type in ('created', 'moved')
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            path = os.fsdecode(path)
+            if path and path.endswith(self.suffix):
+                self.queue.add(path, force=force)
@@ -0,0 +1,269 @@
+"""
+输出文件写入器 - 内容未变化时跳过写入，写入采用临时文件+重命名
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+# 进程的umask（mkstemp创建的文件权限为0600，替换前需恢复为常规权限）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _file_digest(path: Path) -> str:
+    """计算磁盘文件内容的哈希"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """通过同目录临时文件+重命名写入，读取方不会看到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# 流式写入时累积到该大小再编码和写入，避免逐个小片段调用
+_STREAM_BUFFER_SIZE = 64 * 1024
+
+def stream_to_temp(path: Path, chunks: Iterable[str]) -> Tuple[str, int, str]:
+    """将文本片段流式写入 path 同目录下的临时文件
+
+    边写入边计算哈希，内存占用与文件大小无关。临时文件由 commit_temp 替换到目标位置
+    （可以在其他进程中调用，例如由主进程按固定顺序提交子进程写好的页面）。
+
+    Returns:
+        (临时文件路径, 字节数, 内容哈希)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, 'wb') as f:
+            pending = []
+            pending_size = 0
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= _STREAM_BUFFER_SIZE:
+                    data = ''.join(pending).encode('utf-8')
+                    digest.update(data)
+                    f.write(data)
+                    size += len(data)
+                    pending = []
+                    pending_size = 0
+            data = ''.join(pending).encode('utf-8')
+            digest.update(data)
+            f.write(data)
+            size += len(data)
+    except BaseException:
+        discard_temp(tmp_path)
+        raise
+    return tmp_path, size, digest.hexdigest()
+
+def discard_temp(tmp_path: str) -> None:
+    """删除未提交的临时文件"""
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+def commit_temp(path: Path, tmp_path: str, size: int, content_hash: str) -> bool:
+    """内容与现有文件不同时用临时文件替换 path，否则删除临时文件
+
+    Returns:
+        是否实际替换了文件
+    """
+    try:
+        try:
+            unchanged = path.stat().st_size == size and _file_digest(path) == content_hash
+        except OSError:
+            unchanged = False
+
+        if unchanged:
+            os.unlink(tmp_path)
+            return False
+
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        discard_temp(tmp_path)
+        raise
+
+def atomic_write_stream(path: Path, chunks: Iterable[str]) -> bool:
+    """将文本片段流式写入临时文件，内容与现有文件不同时才替换
+
+    Returns:
+        是否实际替换了文件
+    """
+    return commit_temp(path, *stream_to_temp(path, chunks))
+
+class OutputWriter:
+    """生成文档的写入器
+
+    写入前比较新内容与磁盘文件的哈希，相同则跳过，避免无意义地更新mtime
+    触发VitePress重新构建。写入过的文件记录在输出目录的清单中，完整构建结束时
+    删除清单中本次没有再生成的文件（例如已删除模块的页面）。
+    """
+
+    MANIFEST_NAME = ".autodoc-manifest.json"
+
+    def __init__(self, output_path: Union[str, Path]):
+        self.output_path = Path(output_path)
+        self.manifest_file = self.output_path / self.MANIFEST_NAME
+        self._lock = threading.Lock()
+
+        # 由本工具生成的文件（相对输出目录的路径）
+        self._manifest: Set[str] = self._load_manifest()
+        self._saved_manifest = set(self._manifest)
+        # 当前构建中生成的文件
+        self._produced: Set[str] = set()
+        # 上次 take_changes 之后实际写入或删除的文件
+        self._changes: Set[str] = set()
+
+        self.written = 0
+        self.skipped = 0
+        self.deleted = 0
+
+    def _load_manifest(self) -> Set[str]:
+        """读取上次生成的文件清单"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return set(json.load(f).get('files', []))
+        except (OSError, ValueError, AttributeError):
+            return set()
+
+    def _relative(self, path: Path) -> str:
+        """相对输出目录的路径"""
+        return Path(os.path.relpath(path, self.output_path)).as_posix()
+
+    def begin_build(self) -> None:
+        """开始一次完整构建"""
+        with self._lock:
+            self._produced = set()
+            self.written = 0
+            self.skipped = 0
+            self.deleted = 0
+
+    def write_text(self, path: Union[str, Path], content: str) -> bool:
+        """写入文本文件，返回是否实际写入"""
+        path = Path(path)
+        data = content.encode('utf-8')
+
+        changed = True
+        try:
+            if path.stat().st_size == len(data):
+                changed = _file_digest(path) != hashlib.sha256(data).hexdigest()
+        except OSError:
+            pass
+
+        if changed:
+            atomic_write_bytes(path, data)
+
+        self.record(path, changed)
+        return changed
+
+    def write_stream(self, path: Union[str, Path], chunks: Iterable[str]) -> bool:
+        """流式写入文本片段（用于很大的页面），返回是否实际写入"""
+        path = Path(path)
+        changed = atomic_write_stream(path, chunks)
+        self.record(path, changed)
+        return changed
+    
+    def commit(self, path: Union[str, Path], tmp_path: str, size: int, content_hash: str) -> bool:
+        """提交 stream_to_temp 写好的临时文件（内容未变化时跳过），返回是否实际写入"""
+        path = Path(path)
+        changed = commit_temp(path, tmp_path, size, content_hash)
+        self.record(path, changed)
+        return changed
+
+    def record(self, path: Union[str, Path], changed: bool) -> None:
+        """记录写入结果"""
+        relative = self._relative(Path(path))
+        with self._lock:
+            self._manifest.add(relative)
+            self._produced.add(relative)
+            if changed:
+                self.written += 1
+                self._changes.add(relative)
+            else:
+                self.skipped += 1
+
+    def remove(self, path: Union[str, Path]) -> bool:
+        """删除生成的文件，返回文件是否存在"""
+        path = Path(path)
+        relative = self._relative(path)
+        with self._lock:
+            self._manifest.discard(relative)
+            self._produced.discard(relative)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self.deleted += 1
+            self._changes.add(relative)
+        return True
+
+    def finish_build(self) -> None:
+        """结束完整构建：删除本次没有再生成的旧文件并保存清单"""
+        with self._lock:
+            stale = sorted(self._manifest - self._produced)
+            self._manifest = set(self._produced)
+
+        for relative in stale:
+            path = self.output_path / relative
+            try:
+                path.unlink()
+                print(f"🗑️ 删除过期文件: {path}")
+                with self._lock:
+                    self.deleted += 1
+                    self._changes.add(relative)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ 无法删除过期文件 {path}: {e}")
+
+        self.save_manifest()
+
+    def save_manifest(self) -> None:
+        """保存生成文件清单（内容变化时才写入）"""
+        with self._lock:
+            files = sorted(self._manifest)
+            if set(files) == self._saved_manifest and self.manifest_file.exists():
+                return
+            self._saved_manifest = set(files)
+
+        try:
+            data = json.dumps({'files': files}, indent=2, ensure_ascii=False).encode('utf-8')
+            atomic_write_bytes(self.manifest_file, data)
+        except OSError as e:
+            print(f"⚠️ 无法保存生成文件清单 {self.manifest_file}: {e}")
+
+    def take_changes(self) -> List[str]:
+        """返回上次调用以来实际写入或删除的文件（相对路径）并清空记录"""
+        with self._lock:
+            changes = sorted(self._changes)
+            self._changes = set()
+        return changes
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取写入统计"""
+        return {'written': self.written, 'skipped': self.skipped, 'deleted': self.deleted}
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+守护进程基准 - 常驻进程的请求延迟与新启动进程的对比
+
+生成合成项目后启动守护进程（控制接口使用随机端口），测量：
+查询状态、修改单个文件后请求重新生成的延迟，以及多个客户端同时请求时
+实际执行的生成次数（应合并为很少几次）。最后与新启动一个 generate 进程的耗时对比。
+
+用法:
+    python benchmarks/bench_daemon.py [--modules 500] [--rounds 20] [--clients 50]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from auto_doc_server.daemon import DocDaemon
+from auto_doc_server.generator import AutoDocGenerator
+
+def make_module(index: int, version: int) -> str:
+    """生成一个带标记的模块"""
+    return (f'"""合成模块 {index}"""\n\n'
+            f'# @doc_api()\n'
+            f'def func_{index}_v{version}(value: int) -> int:\n'
+            f'    return value\n')
+
+def request(url: str, data: dict = None) -> dict:
+    """发送请求并返回JSON响应"""
+    body = json.dumps(data).encode('utf-8') if data is not None else None
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    with urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers)) as response:
+        return json.loads(response.read())
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="守护进程基准")
+    parser.add_argument('--modules', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--clients', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        project.mkdir()
+        for i in range(args.modules):
+            (project / f"module_{i}.py").write_text(make_module(i, 0), encoding='utf-8')
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            daemon = DocDaemon(AutoDocGenerator(str(project), str(Path(tmp) / "docs")), port=0)
+            httpd = daemon.start()
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{daemon.port}"
+
+        with contextlib.redirect_stdout(output):
+            status_times = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                request(f"{base}/status")
+                status_times.append((time.perf_counter() - start) * 1000)
+
+            regenerate_times = []
+            for i in range(args.rounds):
+                (project / "module_0.py").write_text(make_module(0, i + 1), encoding='utf-8')
+                start = time.perf_counter()
+                result = request(f"{base}/regenerate", {'paths': ["module_0.py"]})
+                regenerate_times.append((time.perf_counter() - start) * 1000)
+                assert result['ok'] and "/module_0" in result['pages'], result
+
+            builds_before = daemon.builds
+            (project / "module_1.py").write_text(make_module(1, 1), encoding='utf-8')
+            with ThreadPoolExecutor(max_workers=args.clients) as executor:
+                results = list(executor.map(
+                    lambda _: request(f"{base}/regenerate", {'paths': ["module_1.py"]}),
+                    range(args.clients)
+                ))
+            concurrent_builds = daemon.builds - builds_before
+
+            request(f"{base}/flush", {})
+            daemon.shutdown()
+            daemon.close()
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "auto_doc_server.cli", "generate", str(project),
+                        "-o", str(Path(tmp) / "cold")], cwd=ROOT, check=True, capture_output=True)
+        cold = time.perf_counter() - start
+
+    print(f"模块数: {args.modules}")
+    print(f"查询状态: 中位数 {statistics.median(status_times):.2f}ms")
+    print(f"重新生成单个文件: 中位数 {statistics.median(regenerate_times):.2f}ms, "
+          f"最大 {max(regenerate_times):.2f}ms")
+    print(f"{args.clients} 个并发请求: 实际生成 {concurrent_builds} 次, "
+          f"全部成功: {all(result['ok'] for result in results)}")
+    print(f"新启动 generate 进程: {cold * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
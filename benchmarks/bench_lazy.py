@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+按需生成模式基准 - 启动耗时与项目规模无关
+
+生成合成项目后分别测量：按需生成服务器启动（只发现文件）、首次请求页面
+（解析并渲染单个模块）、再次请求（缓存命中），以及完整生成全部文档的耗时作对比。
+
+用法:
+    python benchmarks/bench_lazy.py [--modules 2000] [--skip-full]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.generator import AutoDocGenerator
+from auto_doc_server.lazy import LazyDocsServer
+
+def make_project(root: Path, modules: int) -> None:
+    """生成包含多个包和模块的合成项目"""
+    for i in range(modules):
+        package = root / f"pkg_{i % 16}"
+        package.mkdir(exist_ok=True)
+        lines = [f'"""合成模块 {i}"""', ""]
+        for j in range(10):
+            lines.append(f'# @doc_api(category="分类{j % 3}")')
+            lines.append(f"def func_{i}_{j}(value: int, name: str = 'x') -> str:")
+            lines.append(f'    """函数 {j}"""')
+            lines.append("    return name * value")
+            lines.append("")
+        (package / f"module_{i}.py").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+def fetch(url: str) -> float:
+    """请求页面，返回耗时"""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="按需生成模式基准")
+    parser.add_argument('--modules', type=int, default=2000)
+    parser.add_argument('--skip-full', action='store_true', help='不测量完整生成')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        project.mkdir()
+        make_project(project, args.modules)
+
+        start = time.perf_counter()
+        server = LazyDocsServer(AutoDocGenerator(str(project), use_cache=False), port=0)
+        httpd = server.start()
+        startup = time.perf_counter() - start
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+        base = f"http://localhost:{server.port}"
+        index = fetch(f"{base}/")
+        first = fetch(f"{base}/module_{args.modules // 2}.md")
+        cached = fetch(f"{base}/module_{args.modules // 2}.md")
+
+        server.shutdown()
+        httpd.server_close()
+
+        print(f"模块数: {args.modules}")
+        print(f"按需生成启动: {startup:.3f}s, 首页: {index * 1000:.1f}ms")
+        print(f"首次请求页面: {first * 1000:.1f}ms, 缓存命中: {cached * 1000:.1f}ms")
+
+        if not args.skip_full:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                AutoDocGenerator(str(project), str(Path(tmp) / "docs"), use_cache=False).generate()
+            print(f"完整生成: {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+实时刷新延迟基准 - 从保存源文件到浏览器收到推送的耗时
+
+复制示例项目后在后台线程中运行监听模式（启用实时刷新），作为SSE客户端连接，
+反复修改同一个源文件并测量从写入文件到收到包含该页面的推送事件的耗时
+（包括文件系统事件、合并事件的安静期、增量生成和推送，不包括浏览器重新加载页面）。
+
+用法:
+    python benchmarks/bench_livereload.py [--rounds 5]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from auto_doc_server.generator import AutoDocGenerator
+
+def free_port() -> int:
+    """获取一个空闲端口"""
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+def connect(url: str, timeout: float = 30.0):
+    """等待监听进程就绪后连接事件流"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return urllib.request.urlopen(url, timeout=timeout)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+def read_event(stream) -> dict:
+    """读取下一个推送事件"""
+    data = None
+    for line in stream:
+        line = line.decode('utf-8').rstrip('\n')
+        if line.startswith("data: "):
+            data = line[len("data: "):]
+        elif not line and data is not None:
+            return json.loads(data)
+    raise EOFError("事件流已关闭")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="实时刷新延迟基准")
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        project = Path(tmp) / "project"
+        shutil.copytree(ROOT / "example_project", project)
+        target = project / "marker_examples.py"
+        original = target.read_text(encoding='utf-8')
+
+        port = free_port()
+        generator = AutoDocGenerator(str(project), str(Path(tmp) / "docs"), use_cache=False)
+        # 监听线程的输出（redirect_stdout 对所有线程生效，测量结束后恢复）
+        output = io.StringIO()
+        stack.enter_context(contextlib.redirect_stdout(output))
+        threading.Thread(target=generator.watch_and_generate, kwargs={'livereload_port': port},
+                         daemon=True).start()
+        stream = connect(f"http://localhost:{port}/__livereload")
+        time.sleep(0.5)
+
+        latencies = []
+        for i in range(args.rounds):
+            start = time.perf_counter()
+            target.write_text(original + f"\n\n# @doc_api()\ndef bench_round_{i}(value: int) -> int:\n"
+                                         f"    return value\n", encoding='utf-8')
+            while True:
+                event = read_event(stream)
+                if "/marker_examples" in event["pages"]:
+                    break
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.5)
+
+    print(f"轮数: {args.rounds}")
+    print(f"保存到推送: 中位数 {statistics.median(latencies):.1f}ms, "
+          f"最小 {min(latencies):.1f}ms, 最大 {max(latencies):.1f}ms")
+
+if __name__ == "__main__":
+    main()
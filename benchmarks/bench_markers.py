@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+注释标记匹配基准 - 对比逐个模式搜索与单次预编译扫描
+
+参考实现 reference_parse_markers 保留了原先逐个 re.search 的写法，
+基准会先在一组样例和随机生成的文本上确认两者结果完全一致，再比较耗时。
+
+用法:
+    python benchmarks/bench_markers.py [--iterations 20000] [--fuzz 20000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.parser import CommentParser
+
+def reference_parse_markers(text: str) -> dict:
+    """原先的实现：每个标记单独调用一次 re.search"""
+    if not text:
+        return {}
+
+    text = text.strip()
+    result = {'marked': False, 'description': None, 'category': None, 'priority': 0}
+
+    for marker in CommentParser.MARKERS:
+        if re.search(rf'\b{marker}\b', text, re.IGNORECASE):
+            result['marked'] = True
+            break
+
+    for pattern in CommentParser.PARAM_MARKERS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            result['marked'] = True
+            result.update(CommentParser._parse_params(match.group(1)))
+            break
+
+    return result
+
+SAMPLES = [
+    "普通注释，没有任何标记",
+    "TODO: 以后再优化",
+    "@doc",
+    "x@doc bar",
+    "@doc_util",
+    '@doc_util(description="用户数据处理函数", category="用户管理", priority=1)',
+    '@DOC_API(category="接口")',
+    '@doc_api(x @doc(category="内层"))',
+    '@doc_component (description="算法", priority="3")',
+    "email@doc_public.example",
+    '@doc_utıl(category="a")',
+    '@doc_publİc(category="b")',
+    "@DOC_UTİL",
+    "处理数据并返回结果\n\n    Args:\n        data: 输入数据\n\n    @doc_util(category=\"核心功能\")\n",
+    "这是一个很长的文档字符串。" * 20,
+]
+
+def random_text(rng: random.Random) -> str:
+    """生成包含标记片段的随机文本，用于一致性校验"""
+    pieces = ["@doc", "@DOC", "_util", "_api", "_component", "_public", "x", " ", "(",
+              ")", 'category="c"', "priority='2'", "description=\"d\"", "_", "\n", "@", "é",
+              "ı", "İ", "_utıl", "_publİc"]
+    return "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+
+def check_equivalence(fuzz: int) -> None:
+    """确认新旧实现结果一致"""
+    rng = random.Random(0)
+    texts = SAMPLES + [random_text(rng) for _ in range(fuzz)]
+    for text in texts:
+        expected = reference_parse_markers(text)
+        for actual in (CommentParser.parse_comment_markers(text),
+                       CommentParser.parse_docstring_markers(text)):
+            if actual != expected:
+                raise AssertionError(f"结果不一致: {text!r}: {actual} != {expected}")
+    print(f"✅ {len(texts)} 个样例结果一致")
+
+def bench(func, iterations: int) -> float:
+    """返回处理全部样例的总耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in SAMPLES:
+            func(text)
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="注释标记匹配基准")
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--fuzz', type=int, default=20000)
+    args = parser.parse_args()
+
+    check_equivalence(args.fuzz)
+
+    calls = args.iterations * len(SAMPLES)
+    old = bench(reference_parse_markers, args.iterations)
+    new = bench(CommentParser.parse_comment_markers, args.iterations)
+    print(f"逐个模式搜索: {old:.3f}s ({old / calls * 1e6:.2f} us/次)")
+    print(f"单次预编译扫描: {new:.3f}s ({new / calls * 1e6:.2f} us/次)")
+    print(f"加速比: {old / new:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+内存占用基准 - 测量 generate 过程中解析结果常驻内存的大小
+
+生成一个合成项目并解析全部文件，用 tracemalloc 测量保存 ModuleInfo 列表所占的内存。
+"按需读取源代码"为当前实现；"预先保存源代码"在同样的解析结果之外额外保存每个
+函数、方法和类的 source_code 字符串，模拟此前记录中直接存放源代码的内存占用。
+
+用法:
+    python benchmarks/bench_memory.py [--files 200] [--classes 10] [--methods 8]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.parser import PythonParser
+
+def make_module(index: int, classes: int, methods: int) -> str:
+    """生成包含若干个类和函数的合成模块"""
+    parts = [f'"""合成模块 {index}"""', ""]
+    for c in range(classes):
+        parts.append(f"class Service{c}:")
+        parts.append(f'    """服务 {c}"""')
+        for m in range(methods):
+            parts.append(f"    def handle_{m}(self, request: dict, retries: int = 3) -> dict:")
+            parts.append(f'        """处理请求 {m}"""')
+            for line in range(10):
+                parts.append(f"        result_{line} = request.get('key_{line}', {line}) * retries")
+            parts.append("        return request")
+            parts.append("")
+        parts.append(f"def helper_{c}(value: str) -> str:")
+        parts.append("    return value.strip()")
+        parts.append("")
+    return "\n".join(parts)
+
+def symbol_count(modules) -> int:
+    """统计函数、方法和类的总数"""
+    count = 0
+    for module in modules:
+        count += len(module.functions) + len(module.classes)
+        count += sum(len(cls.methods) for cls in module.classes)
+    return count
+
+def eager_sources(modules) -> list:
+    """为每个符号保存一份源代码字符串（模拟预先保存源代码的记录）"""
+    sources = []
+    for module in modules:
+        for func in module.functions:
+            sources.append(func.source_code)
+        for cls in module.classes:
+            sources.append(cls.source_code)
+            sources.extend(method.source_code for method in cls.methods)
+    return sources
+
+def measure(files, include_sources: bool) -> tuple:
+    """返回 (保留的内存字节数, 峰值字节数, 符号数)"""
+    parser = PythonParser(include_all=True)
+    gc.collect()
+    tracemalloc.start()
+    modules = [parser.parse_file(path) for path in files]
+    sources = eager_sources(modules) if include_sources else None
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    symbols = symbol_count(modules)
+    del modules, sources
+    return current, peak, symbols
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="解析结果内存占用基准")
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--classes', type=int, default=10)
+    parser.add_argument('--methods', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            path = Path(tmp) / f"module_{i}.py"
+            path.write_text(make_module(i, args.classes, args.methods), encoding='utf-8')
+            files.append(path)
+
+        lazy, lazy_peak, symbols = measure(files, include_sources=False)
+        eager, eager_peak, _ = measure(files, include_sources=True)
+
+    mb = 1024 * 1024
+    print(f"文件数: {args.files}, 符号数: {symbols}")
+    print(f"按需读取源代码: 常驻 {lazy / mb:.1f} MB, 峰值 {lazy_peak / mb:.1f} MB")
+    print(f"预先保存源代码: 常驻 {eager / mb:.1f} MB, 峰值 {eager_peak / mb:.1f} MB")
+    print(f"常驻内存减少: {(1 - lazy / eager) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+解析性能基准 - 验证大文件的解析耗时随定义数量线性增长
+
+生成包含不同数量函数和类的合成模块，分别测量 PythonParser.parse_file 的耗时。
+若每个定义的平均耗时基本不变，说明解析为线性复杂度。
+
+用法:
+    python benchmarks/bench_parse_lines.py [--sizes 500 1000 2000 4000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.parser import PythonParser
+
+def make_module(definitions: int) -> str:
+    """生成包含指定数量定义的合成模块（函数与带方法的类各占一半）"""
+    parts = ['"""合成基准模块"""', "", "import os", ""]
+    for i in range(definitions // 2):
+        parts.append(f"# @doc_util(category=\"分类{i % 7}\")")
+        parts.append(f"def func_{i}(a: int, b: str = 'x') -> str:")
+        parts.append(f'    """函数 {i}"""')
+        parts.append("    value = a * 2")
+        parts.append("    return b * value")
+        parts.append("")
+        parts.append(f"class Class{i}:")
+        parts.append(f'    """类 {i}\n\n    @doc\n    """')
+        parts.append("    def method(self, x: int) -> int:")
+        parts.append("        return x + 1")
+        parts.append("")
+    return "\n".join(parts)
+
+def bench(definitions: int, repeat: int) -> float:
+    """返回解析指定规模模块的最短耗时（秒）"""
+    parser = PythonParser(include_all=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"synthetic_{definitions}.py"
+        path.write_text(make_module(definitions), encoding='utf-8')
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parser.parse_file(path)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="解析耗时线性度基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2000, 4000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'定义数':>8} {'行数':>8} {'耗时(ms)':>10} {'每定义(us)':>12}")
+    for size in args.sizes:
+        lines = make_module(size).count("\n") + 1
+        elapsed = bench(size, args.repeat)
+        print(f"{size:>8} {lines:>8} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+符号记录内存基准 - 对比紧凑记录与此前的记录结构
+
+"紧凑记录"为当前的 __slots__ 记录、ParameterInfo 参数和驻留字符串；
+"此前结构"在基准内复制了旧的定义（普通 dataclass、参数字典、未驻留的字符串），
+由同一批解析结果转换得到，两者内容完全相同。
+
+用法:
+    python benchmarks/bench_records.py [--functions 20000]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.parser import FunctionInfo, ParameterInfo, PythonParser
+
+@dataclass
+class LegacyFunctionInfo:
+    """此前的函数记录结构"""
+    name: str
+    docstring: str
+    signature: str
+    parameters: List[Dict[str, Any]]
+    return_type: Optional[str]
+    line_number: int
+    end_line_number: int
+    category: Optional[str] = None
+    priority: int = 0
+    comment_marked: bool = False
+    source_file: Optional[str] = None
+
+TYPES = ["str", "int", "Optional[str]", "Dict[str, Any]", "List[int]", "bool"]
+
+def make_module(functions: int) -> str:
+    """生成包含大量带类型注解函数的合成模块"""
+    parts = ['"""记录基准模块"""', ""]
+    for i in range(functions):
+        a, b, r = TYPES[i % 6], TYPES[(i + 1) % 6], TYPES[(i + 2) % 6]
+        parts.append(f'# @doc_util(category="分类{i % 5}")')
+        parts.append(f"def func_{i}(name: {a}, value: {b} = None, flag: bool = False) -> {r}:")
+        parts.append("    pass")
+    return "\n".join(parts)
+
+def copy_str(value: Optional[str]) -> Optional[str]:
+    """生成内容相同的新字符串对象（模拟未驻留的字符串）"""
+    return (value + ".")[:-1] if value else value
+
+def to_compact(func) -> FunctionInfo:
+    """复制一份当前结构的记录（字符串为驻留的同一对象）"""
+    return FunctionInfo(
+        name=func.name,
+        docstring=func.docstring,
+        signature=func.signature,
+        parameters=[ParameterInfo(p.name, p.type, p.default) for p in func.parameters],
+        return_type=func.return_type,
+        line_number=func.line_number,
+        end_line_number=func.end_line_number,
+        category=func.category,
+        priority=func.priority,
+        comment_marked=func.comment_marked,
+        source_file=func.source_file
+    )
+
+def to_legacy(func) -> LegacyFunctionInfo:
+    """将当前记录转换为此前的结构"""
+    return LegacyFunctionInfo(
+        name=func.name,
+        docstring=func.docstring,
+        signature=func.signature,
+        parameters=[
+            {'name': p.name, 'type': copy_str(p.type), 'default': copy_str(p.default)}
+            for p in func.parameters
+        ],
+        return_type=copy_str(func.return_type),
+        line_number=func.line_number,
+        end_line_number=func.end_line_number,
+        category=copy_str(func.category),
+        priority=func.priority,
+        comment_marked=func.comment_marked,
+        source_file=func.source_file
+    )
+
+def measure(build) -> int:
+    """返回 build() 构建的对象常驻的内存字节数"""
+    gc.collect()
+    tracemalloc.start()
+    records = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="符号记录内存基准")
+    parser.add_argument('--functions', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "records.py"
+        path.write_text(make_module(args.functions), encoding='utf-8')
+        module = PythonParser().parse_file(path)
+
+    functions = module.functions
+    compact = measure(lambda: [to_compact(f) for f in functions])
+    legacy = measure(lambda: [to_legacy(f) for f in functions])
+
+    count = len(functions)
+    print(f"函数数: {count}")
+    print(f"紧凑记录: {compact / count:.0f} 字节/符号")
+    print(f"此前结构: {legacy / count:.0f} 字节/符号")
+    print(f"减少: {(1 - compact / legacy) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+页面渲染内存基准 - 对比整页渲染与流式写入的峰值内存
+
+生成一个包含大量长方法的合成模块，分别用 template.render() 拼接整个页面后写入
+（此前的实现）和 template.generate() 逐段流式写入（当前实现），用 tracemalloc
+测量渲染写入过程中的峰值内存，并确认两者写出的内容完全相同。
+
+用法:
+    python benchmarks/bench_render_memory.py [--classes 40] [--methods 50]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.parser import PythonParser
+from auto_doc_server.template_markdown_generator import TemplateMarkdownGenerator
+
+def make_module(classes: int, methods: int) -> str:
+    """生成每个方法都带较长源代码的合成模块"""
+    parts = ['"""渲染基准模块"""', ""]
+    for c in range(classes):
+        parts.append(f"class Api{c}:")
+        parts.append(f'    """接口 {c}"""')
+        for m in range(methods):
+            parts.append(f"    def call_{m}(self, payload: dict, timeout: float = 1.0) -> dict:")
+            parts.append(f'        """调用 {m}"""')
+            for line in range(20):
+                parts.append(f"        value_{line} = payload.get('field_{line}', {line}) * timeout")
+            parts.append("        return payload")
+            parts.append("")
+    return "\n".join(parts)
+
+def render_whole(generator: TemplateMarkdownGenerator, module, config, path: Path) -> None:
+    """此前的实现：渲染为一个字符串后写入"""
+    content = generator.render_module(module, config)
+    generator.writer.write_text(path, content)
+
+def render_stream(generator: TemplateMarkdownGenerator, module, config, path: Path) -> None:
+    """当前实现：逐段流式写入"""
+    generator.writer.write_stream(path, generator.iter_module(module, config))
+
+def measure_peak(func, *args) -> int:
+    """返回 func 执行期间新分配内存的峰值字节数"""
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="页面渲染内存基准")
+    parser.add_argument('--classes', type=int, default=40)
+    parser.add_argument('--methods', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        source = tmp_path / "huge_api.py"
+        source.write_text(make_module(args.classes, args.methods), encoding='utf-8')
+        module = PythonParser(include_all=True).parse_file(source)
+
+        generator = TemplateMarkdownGenerator(output_path=str(tmp_path / "docs"), reproducible=True)
+        config = generator.get_default_config()
+        generator.load_templates()
+
+        whole_path = tmp_path / "docs" / "whole.md"
+        stream_path = tmp_path / "docs" / "stream.md"
+        whole = measure_peak(render_whole, generator, module, config, whole_path)
+        stream = measure_peak(render_stream, generator, module, config, stream_path)
+
+        size = stream_path.stat().st_size
+        identical = whole_path.read_bytes() == stream_path.read_bytes()
+
+    print(f"页面大小: {size / 1024 / 1024:.1f} MiB")
+    print(f"整页渲染峰值内存: {whole / 1024 / 1024:.1f} MiB")
+    print(f"流式写入峰值内存: {stream / 1024 / 1024:.1f} MiB")
+    print(f"输出一致: {'是' if identical else '否'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+可复现构建检查 - 串行与并行解析生成的文档树必须字节级一致
+
+以可复现模式、不使用缓存分别用 1 个进程和多个进程生成文档，逐个比较输出文件
+（不含 .autodoc-cache），有差异时以非零状态退出，可直接用于CI。
+
+用法:
+    python benchmarks/bench_reproducible.py [--project example_project] [--jobs 4]
+    python benchmarks/bench_reproducible.py --modules 200
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.generator import AutoDocGenerator
+
+def make_project(root: Path, modules: int) -> None:
+    """生成包含多个包和模块的合成项目"""
+    for i in range(modules):
+        package = root / f"pkg_{i % 8}"
+        package.mkdir(exist_ok=True)
+        lines = [f'"""合成模块 {i}"""', ""]
+        for j in range(10):
+            lines.append(f'# @doc_api(category="分类{j % 3}")')
+            lines.append(f"def func_{i}_{j}(value: int, name: str = 'x') -> str:")
+            lines.append(f'    """函数 {j}"""')
+            lines.append("    return name * value")
+            lines.append("")
+        lines.append("# @doc_component")
+        lines.append(f"class Component{i}:")
+        lines.append('    """组件"""')
+        lines.append("    def run(self) -> None:")
+        lines.append("        pass")
+        (package / f"module_{i}.py").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+def build(project: Path, output: Path, jobs: int) -> float:
+    """生成一次文档，返回耗时"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        AutoDocGenerator(
+            project_path=str(project),
+            output_path=str(output),
+            jobs=jobs,
+            use_cache=False,
+            reproducible=True
+        ).generate()
+    return time.perf_counter() - start
+
+def tree_digest(root: Path) -> Dict[str, str]:
+    """输出目录中各文件（相对路径）的内容哈希"""
+    digests = {}
+    for path in sorted(root.rglob('*')):
+        relative = path.relative_to(root)
+        if path.is_file() and relative.parts[0] != '.autodoc-cache':
+            digests[relative.as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digests
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="可复现构建检查")
+    parser.add_argument('--project', help='项目路径（默认生成合成项目）')
+    parser.add_argument('--modules', type=int, default=100, help='合成项目的模块数')
+    parser.add_argument('--jobs', type=int, default=max(2, os.cpu_count() or 1), help='并行构建的进程数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        if args.project:
+            project = Path(args.project)
+        else:
+            project = tmp_path / "project"
+            project.mkdir()
+            make_project(project, args.modules)
+
+        serial_time = build(project, tmp_path / "serial", 1)
+        parallel_time = build(project, tmp_path / "parallel", args.jobs)
+        serial = tree_digest(tmp_path / "serial")
+        parallel = tree_digest(tmp_path / "parallel")
+
+    print(f"文件数: {len(serial)}")
+    print(f"串行构建: {serial_time:.3f}s")
+    print(f"并行构建 ({args.jobs} 进程): {parallel_time:.3f}s")
+
+    differences = sorted(
+        name for name in serial.keys() | parallel.keys()
+        if serial.get(name) != parallel.get(name)
+    )
+    if differences:
+        print(f"❌ 输出不一致 ({len(differences)} 个文件):")
+        for name in differences:
+            print(f"  {name}")
+        return 1
+
+    print("✅ 串行与并行构建的输出完全一致")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
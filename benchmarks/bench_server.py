@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+内置文档服务器基准 - 大量并发读者请求同一批页面
+
+生成示例项目的文档后启动内置服务器，用多个线程并发请求所有页面，
+报告吞吐量以及实际渲染次数（每个页面只应渲染一次）。
+
+用法:
+    python benchmarks/bench_server.py [--clients 200] [--requests 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from auto_doc_server.generator import AutoDocGenerator
+from auto_doc_server.server import DocsServer
+
+def fetch(url: str) -> int:
+    """请求页面（接受gzip），返回状态码"""
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    with urllib.request.urlopen(request) as response:
+        response.read()
+        return response.status
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="内置文档服务器基准")
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            AutoDocGenerator(str(ROOT / "example_project"), tmp, use_cache=False).generate()
+
+        server = DocsServer(tmp, port=0)
+        httpd = server.start()
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+        pages = sorted(path.name for path in Path(tmp).glob('*.md'))
+        urls = [f"http://localhost:{server.port}/{pages[i % len(pages)]}" for i in range(args.requests)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as executor:
+            statuses = list(executor.map(fetch, urls))
+        elapsed = time.perf_counter() - start
+
+        server.shutdown()
+        httpd.server_close()
+
+    stats = server.cache.get_stats()
+    print(f"页面数: {len(pages)}, 并发: {args.clients}, 请求数: {args.requests}")
+    print(f"成功: {statuses.count(200)}, 耗时: {elapsed:.2f}s, 吞吐量: {args.requests / elapsed:.0f} 请求/秒")
+    print(f"渲染次数: {stats['renders']}, 缓存命中: {stats['hits']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+源代码去重基准 - 对比 full 与 dedupe 两种源代码输出方式的文档大小和生成耗时
+
+分别对 example_project 和一个以类为主的合成项目生成文档（包含所有函数和类），
+统计输出的Markdown总大小。
+
+用法:
+    python benchmarks/bench_source_dedupe.py [--modules 100] [--classes 5] [--methods 10]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from auto_doc_server.generator import AutoDocGenerator
+
+def make_project(root: Path, modules: int, classes: int, methods: int) -> None:
+    """生成以类为主的合成项目"""
+    for i in range(modules):
+        parts = [f'"""合成模块 {i}"""', ""]
+        for c in range(classes):
+            parts.append(f"class Service{c}:")
+            parts.append(f'    """服务 {c}"""')
+            for m in range(methods):
+                parts.append(f"    def handle_{m}(self, request: dict, retries: int = 3) -> dict:")
+                parts.append(f'        """处理请求 {m}"""')
+                for line in range(8):
+                    parts.append(f"        value_{line} = request.get('key_{line}', {line}) * retries")
+                parts.append("        return request")
+                parts.append("")
+        (root / f"module_{i}.py").write_text("\n".join(parts), encoding='utf-8')
+
+def build(project: Path, output: Path, source_mode: str) -> float:
+    """以指定的源代码输出方式生成文档，返回耗时"""
+    config = output.parent / f"{output.name}.yaml"
+    config.write_text(f"reproducible: true\nmarkdown:\n  source_mode: {source_mode}\n", encoding='utf-8')
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        AutoDocGenerator(
+            project_path=str(project),
+            output_path=str(output),
+            config_path=str(config),
+            include_all=True,
+            use_cache=False
+        ).generate()
+    return time.perf_counter() - start
+
+def markdown_size(root: Path) -> int:
+    """输出目录中Markdown文件的总字节数"""
+    return sum(path.stat().st_size for path in root.glob('*.md'))
+
+def compare(name: str, project: Path, tmp_path: Path) -> None:
+    """对比一个项目两种方式的输出"""
+    results = {}
+    for mode in ('full', 'dedupe'):
+        output = tmp_path / f"{name}-{mode}"
+        elapsed = build(project, output, mode)
+        results[mode] = (markdown_size(output), elapsed)
+
+    full_size, full_time = results['full']
+    dedupe_size, dedupe_time = results['dedupe']
+    print(f"{name}:")
+    print(f"  full:   {full_size / 1024:.1f} KiB ({full_time:.3f}s)")
+    print(f"  dedupe: {dedupe_size / 1024:.1f} KiB ({dedupe_time:.3f}s)")
+    print(f"  减少: {(1 - dedupe_size / full_size) * 100:.0f}%")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="源代码去重基准")
+    parser.add_argument('--modules', type=int, default=100)
+    parser.add_argument('--classes', type=int, default=5)
+    parser.add_argument('--methods', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        compare("example_project", ROOT / "example_project", tmp_path)
+
+        project = tmp_path / "synthetic"
+        project.mkdir()
+        make_project(project, args.modules, args.classes, args.methods)
+        compare("合成项目", project, tmp_path)
+
+if __name__ == "__main__":
+    main()
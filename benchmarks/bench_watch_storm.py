@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+监听模式事件风暴基准 - 模拟 git checkout 一次修改大量文件
+
+在后台线程中运行监听模式，短时间内修改大量源文件，统计实际执行的生成次数、
+每批的文件数以及从最后一次修改到生成完成的耗时。事件合并后应只生成很少几次，
+超过 storm_threshold 时改为一次完整重建，且最后一次修改一定被处理。
+
+用法:
+    python benchmarks/bench_watch_storm.py [--modules 2000] [--touch 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.generator import AutoDocGenerator
+
+def make_module(index: int, version: int) -> str:
+    """生成一个带标记的模块"""
+    return (f'"""合成模块 {index}"""\n\n'
+            f'# @doc_api()\n'
+            f'def func_{index}_v{version}(value: int) -> int:\n'
+            f'    return value\n')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="监听模式事件风暴基准")
+    parser.add_argument('--modules', type=int, default=2000)
+    parser.add_argument('--touch', type=int, default=2000, help='修改的文件数')
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        project = tmp / "project"
+        for i in range(args.modules):
+            package = project / f"pkg_{i % 16}"
+            package.mkdir(parents=True, exist_ok=True)
+            (package / f"module_{i}.py").write_text(make_module(i, 0), encoding='utf-8')
+
+        generator = AutoDocGenerator(str(project), str(tmp / "docs"), use_cache=False)
+        batches = []
+        building = threading.Event()
+        apply_changes = generator.apply_changes
+
+        def record(batch, *args):
+            building.set()
+            start = time.perf_counter()
+            mode = "failed"
+            try:
+                mode, changed = apply_changes(batch, *args)
+                return mode, changed
+            finally:
+                batches.append((len(batch.paths), mode, batch.events, time.perf_counter() - start))
+                building.clear()
+
+        generator.apply_changes = record
+
+        # 监听线程的输出（redirect_stdout 对所有线程生效，测量结束后恢复）
+        output = io.StringIO()
+        stack.enter_context(contextlib.redirect_stdout(output))
+        threading.Thread(target=generator.watch_and_generate, daemon=True).start()
+        while "开始监听文件变化" not in output.getvalue():
+            time.sleep(0.05)
+
+        touched = min(args.touch, args.modules)
+        for i in range(touched):
+            (project / f"pkg_{i % 16}" / f"module_{i}.py").write_text(make_module(i, 1), encoding='utf-8')
+        last_write = time.perf_counter()
+
+        # 等待最后修改的文件出现在输出中且没有进行中的生成
+        last_page = tmp / "docs" / f"module_{touched - 1}.md"
+        deadline = time.monotonic() + args.timeout
+        while time.monotonic() < deadline:
+            if (not building.is_set() and last_page.exists()
+                    and f"func_{touched - 1}_v1" in last_page.read_text(encoding='utf-8')):
+                break
+            time.sleep(0.05)
+        settled = time.perf_counter() - last_write
+        # 确认之后没有多余的生成
+        time.sleep(1.0)
+        while building.is_set():
+            time.sleep(0.05)
+
+    print(f"模块数: {args.modules}, 修改文件数: {touched}")
+    print(f"生成次数: {len(batches)}, 最后修改到页面更新: {settled:.2f}s")
+    for paths, mode, events, seconds in batches:
+        print(f"  - {mode}: {paths} 个文件, {events} 个事件, 耗时 {seconds:.2f}s")
+
+if __name__ == "__main__":
+    main()
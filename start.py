@@ -72,8 +72,11 @@ def install_dependencies():
         print(f"❌ 依赖安装失败: {e}")
         return False
 
+# 配置文件（存在时使用，可由 auto_doc_server.cli init 创建）
+CONFIG_FILE = "config.yaml"
+
 def generate_docs():
-    """生成文档"""
+    """生成文档，返回生成器使用的配置（失败时返回None）"""
     print("📝 生成文档...")
     
     try:
@@ -82,18 +85,19 @@ def generate_docs():
         generator = AutoDocGenerator(
             project_path="./example_project",
             output_path="./generated_docs",
+            config_path=CONFIG_FILE if Path(CONFIG_FILE).exists() else None,
             include_all=False
         )
         generator.generate()
         print("✅ 文档生成完成")
-        return True
+        return generator.config
         
     except Exception as e:
         print(f"❌ 文档生成失败: {e}")
-        return False
+        return None
 
-def setup_vitepress():
-    """设置VitePress"""
+def setup_vitepress(config=None):
+    """设置VitePress（侧边栏模式读取配置中的 web.sidebar）"""
     print("🌐 设置VitePress...")
     
     try:
@@ -115,10 +119,12 @@ def setup_vitepress():
         # 使用Jinja2模板生成VitePress配置
         from web.vitepress_config_generator import VitePressConfigGenerator
         
+        web_config = (config or {}).get('web') or {}
         generator = VitePressConfigGenerator(
             generated_docs_path="generated_docs",
             template_dir="web/templates",
-            output_dir="web/docs/.vitepress"
+            output_dir="web/docs/.vitepress",
+            sidebar_mode=web_config.get('sidebar', 'inline')
         )
         
         if not generator.generate_and_save():
@@ -157,11 +163,12 @@ def main():
         return 1
     
     # 生成文档
-    if not generate_docs():
+    config = generate_docs()
+    if config is None:
         return 1
     
     # 设置VitePress
-    if not setup_vitepress():
+    if not setup_vitepress(config):
         return 1
     
     # 启动服务器
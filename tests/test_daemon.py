@@ -0,0 +1,119 @@
+"""
+守护进程测试 - 控制接口的来源检查和并发请求合并
+"""
+
+import http.client
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.daemon import DocDaemon
+from auto_doc_server.generator import AutoDocGenerator
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+@pytest.fixture
+def daemon(tmp_path):
+    """在随机端口上启动守护进程"""
+    project = tmp_path / "project"
+    project.mkdir()
+    for i in range(3):
+        (project / f"module_{i}.py").write_text(
+            f'# @doc_api(category="接口")\ndef api_{i}() -> int:\n    return {i}\n',
+            encoding='utf-8'
+        )
+
+    instance = DocDaemon(AutoDocGenerator(str(project), str(tmp_path / "docs")), port=0)
+    httpd = instance.start()
+    server = threading.Thread(target=httpd.serve_forever, daemon=True)
+    server.start()
+    yield instance
+    instance.shutdown()
+    server.join()
+    instance.close()
+
+def request(daemon: DocDaemon, path: str, body: Optional[bytes] = None,
+            headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, Any]]:
+    """发送请求，返回 (状态码, JSON响应)"""
+    req = urllib.request.Request(f"http://127.0.0.1:{daemon.port}{path}", data=body, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_post_with_foreign_host_is_forbidden(daemon):
+    headers = dict(JSON_HEADERS, Host="evil.example:7878")
+    status, body = request(daemon, "/shutdown", b"{}", headers)
+    assert status == 403
+    assert not body['ok']
+    assert request(daemon, "/status")[0] == 200
+
+def test_post_with_foreign_origin_is_forbidden(daemon):
+    headers = dict(JSON_HEADERS, Origin="http://evil.example")
+    status, _ = request(daemon, "/regenerate", b"{}", headers)
+    assert status == 403
+    assert daemon.builds == 0
+
+def test_post_with_own_origin_is_allowed(daemon):
+    headers = dict(JSON_HEADERS, Origin=f"http://localhost:{daemon.port}")
+    status, body = request(daemon, "/flush", b"{}", headers)
+    assert status == 200
+    assert body['modules'] == 3
+
+@pytest.mark.parametrize("content_type", [None, "application/x-www-form-urlencoded", "text/plain"])
+def test_post_without_json_content_type_is_rejected(daemon, content_type):
+    # urllib 总会为请求体加上表单类型，这里直接发送原始请求
+    connection = http.client.HTTPConnection("127.0.0.1", daemon.port, timeout=10)
+    headers = {'Content-Type': content_type} if content_type else {}
+    connection.request("POST", "/regenerate", body=b"{}", headers=headers)
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    assert response.status == 415
+    assert daemon.builds == 0
+
+def test_concurrent_regenerate_requests_share_one_build(daemon):
+    started = threading.Event()
+    release = threading.Event()
+    apply_changes = daemon.generator.apply_changes
+
+    def blocking_apply_changes(batch, **kwargs):
+        # 第一次生成阻塞，期间到达的请求都应合并到下一次生成
+        if not started.is_set():
+            started.set()
+            release.wait(10)
+        return apply_changes(batch, **kwargs)
+
+    daemon.generator.apply_changes = blocking_apply_changes
+
+    def regenerate(index: int) -> Tuple[int, Dict[str, Any]]:
+        body = json.dumps({'paths': [f"module_{index % 3}.py"]}).encode('utf-8')
+        return request(daemon, "/regenerate", body, JSON_HEADERS)
+
+    clients = 8
+    with ThreadPoolExecutor(max_workers=clients + 1) as executor:
+        first = executor.submit(regenerate, 0)
+        assert started.wait(10)
+        others = [executor.submit(regenerate, i) for i in range(clients)]
+        deadline = time.monotonic() + 10
+        while daemon.requests < clients + 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        results = [first.result()] + [future.result() for future in others]
+
+    assert all(status == 200 and body['ok'] for status, body in results)
+    assert daemon.builds == 2
+    assert results[0][1]['requests'] == 1
+    assert all(body['requests'] == clients for _, body in results[1:])
+    assert daemon.last_build['files'] == 3
@@ -0,0 +1,72 @@
+"""
+文件发现测试 - 排除规则按.gitignore的glob语义匹配
+"""
+
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.discovery import FileDiscovery, IgnoreRules
+
+def make_files(root: Path, paths: List[str]) -> None:
+    for rel_path in paths:
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n", encoding='utf-8')
+
+def discover(root: Path, patterns: List[str], suffix: str = ".py") -> List[str]:
+    discovery = FileDiscovery(root, exclude_patterns=patterns, suffix=suffix)
+    return [path.relative_to(root).as_posix() for path in discovery.discover()]
+
+def test_extension_pattern_matches_at_any_depth():
+    rules = IgnoreRules(["*.pyc"])
+    assert rules.match("module.pyc", False)
+    assert rules.match("pkg/sub/module.pyc", False)
+    assert rules.match("module.py", False) is None
+    assert rules.match("module.pyc.py", False) is None
+
+def test_directory_pattern_does_not_exclude_similar_file_names(tmp_path):
+    make_files(tmp_path, ["environment.py", "env/settings.py", "pkg/env/hook.py", "pkg/env.py"])
+    assert discover(tmp_path, ["env/"]) == ["environment.py", "pkg/env.py"]
+
+def test_directory_pattern_only_matches_directories():
+    rules = IgnoreRules(["env/"])
+    assert rules.match("env", True)
+    assert rules.match("env", False) is None
+    assert rules.match("environment", True) is None
+
+def test_double_star_patterns(tmp_path):
+    make_files(tmp_path, [
+        "a.py",
+        "gen/a_pb2.py",
+        "pkg/deep/gen/b_pb2.py",
+        "pkg/tests/test_a.py",
+        "pkg/x/tests/test_b.py",
+        "docs/build/c.py",
+        "docs/build/nested/d.py",
+    ])
+    assert discover(tmp_path, ["**/*_pb2.py", "pkg/**/tests/", "docs/**"]) == ["a.py"]
+
+def test_double_star_matches_zero_directories():
+    rules = IgnoreRules(["**/gen/*.py"])
+    assert rules.match("gen/a.py", False)
+    assert rules.match("x/y/gen/a.py", False)
+    assert rules.match("x/gen/sub/a.py", False) is None
+
+def test_anchored_single_star_does_not_cross_directories():
+    rules = IgnoreRules(["pkg/*.py"])
+    assert rules.match("pkg/a.py", False)
+    assert rules.match("pkg/sub/a.py", False) is None
+    assert rules.match("other/pkg/a.py", False) is None
+
+def test_negation_reincludes_file(tmp_path):
+    make_files(tmp_path, ["a_pb2.py", "keep_pb2.py", "b.py"])
+    assert discover(tmp_path, ["*_pb2.py", "!keep_pb2.py"]) == ["b.py", "keep_pb2.py"]
+
+def test_gitignore_is_applied_relative_to_its_directory(tmp_path):
+    make_files(tmp_path, ["build.py", "pkg/build/a.py", "pkg/main.py", "build/b.py"])
+    (tmp_path / "pkg" / ".gitignore").write_text("/build/\n", encoding='utf-8')
+    assert discover(tmp_path, []) == ["build.py", "build/b.py", "pkg/main.py"]
+    assert FileDiscovery(tmp_path).is_excluded(str(tmp_path / "pkg" / "build" / "a.py"))
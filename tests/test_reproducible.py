@@ -0,0 +1,80 @@
+"""
+可复现构建测试 - 串行与并行生成的文档树必须字节级一致
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.generator import AutoDocGenerator
+
+def make_project(root: Path) -> None:
+    """生成包含同名模块（p0/utils.py ... p11/utils.py）的项目"""
+    for i in range(12):
+        package = root / f"p{i}"
+        package.mkdir(parents=True)
+        (package / "utils.py").write_text(
+            f'"""工具模块 {i}"""\n'
+            "\n"
+            f'# @doc_util(category="分类{i % 3}")\n'
+            f"def helper_{i}(value: int) -> int:\n"
+            f'    """返回 {i} 倍"""\n'
+            f"    return value * {i}\n"
+            "\n"
+            "# @doc_component\n"
+            f"class Component{i}:\n"
+            "    def run(self) -> None:\n"
+            "        pass\n",
+            encoding='utf-8'
+        )
+        (package / f"module_{i}.py").write_text(
+            f'# @doc_api(category="接口")\ndef api_{i}() -> str:\n    return "{i}"\n',
+            encoding='utf-8'
+        )
+
+def build(project: Path, output: Path, jobs: int) -> None:
+    """以可复现模式、不使用缓存生成一次文档"""
+    AutoDocGenerator(
+        project_path=str(project),
+        output_path=str(output),
+        jobs=jobs,
+        use_cache=False,
+        reproducible=True
+    ).generate()
+
+def read_tree(root: Path) -> Dict[str, bytes]:
+    """输出目录中的文件内容（不含 .autodoc-cache）"""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob('*'))
+        if path.is_file() and '.autodoc-cache' not in path.relative_to(root).parts
+    }
+
+def test_serial_and_parallel_builds_are_identical(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    project = tmp_path / "project"
+    make_project(project)
+
+    build(project, tmp_path / "serial", jobs=1)
+    build(project, tmp_path / "parallel", jobs=4)
+
+    serial = read_tree(tmp_path / "serial")
+    parallel = read_tree(tmp_path / "parallel")
+    assert "utils.md" in serial
+    assert sorted(serial) == sorted(parallel)
+    for name, content in serial.items():
+        assert parallel[name] == content, f"{name} 不一致"
+
+def test_duplicate_module_names_keep_last_module(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    project = tmp_path / "project"
+    make_project(project)
+
+    # 文件按路径排序，p9 是最后一个 utils.py，与串行生成一样由它决定页面内容
+    for _ in range(3):
+        build(project, tmp_path / "parallel", jobs=4)
+        content = (tmp_path / "parallel" / "utils.md").read_text(encoding='utf-8')
+        assert "helper_9" in content
+        assert "helper_7" not in content
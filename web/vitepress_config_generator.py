@@ -4,22 +4,41 @@ VitePress配置生成器
 使用Jinja2模板动态生成VitePress配置文件
 """
 
-import os
+import argparse
+import hashlib
+import sys
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from jinja2 import Environment, FileSystemLoader
 
+# 直接运行脚本时项目根目录不在 sys.path 中
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auto_doc_server.doc_ir import IR_FILE, load_doc_ir
+from auto_doc_server.writer import atomic_write_bytes
+
 class VitePressConfigGenerator:
     """VitePress配置生成器"""
     
+    # 侧边栏模式：inline 所有文档直接写在 config.ts 中；
+    # split 按包分组，每组写入 sidebar 目录下单独的JSON文件，由 config.ts 导入
+    # （也可在配置文件中设置 web.sidebar）
+    SIDEBAR_MODES = ("inline", "split")
+    SIDEBAR_DIR = "sidebar"
+    
     def __init__(self, generated_docs_path: str = "../generated_docs", 
                  template_dir: str = "templates",
-                 output_dir: str = "docs/.vitepress"):
+                 output_dir: str = "docs/.vitepress",
+                 sidebar_mode: str = "inline"):
         self.generated_docs_path = Path(generated_docs_path)
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
+        if sidebar_mode not in self.SIDEBAR_MODES:
+            print(f"⚠️ 未知的侧边栏模式 {sidebar_mode}，使用 inline")
+            sidebar_mode = "inline"
+        self.sidebar_mode = sidebar_mode
         
         # 初始化Jinja2环境
         self.jinja_env = Environment(
@@ -29,15 +48,24 @@ class VitePressConfigGenerator:
         )
     
     def parse_generated_docs(self) -> List[Dict[str, Any]]:
-        """解析生成的文档，提取路由信息"""
+        """获取生成文档的路由信息
+        
+        优先读取文档生成器输出的中间表示；没有中间表示（旧版本生成的文档）时
+        解析Markdown文件。
+        """
         docs = []
         
         if not self.generated_docs_path.exists():
             print(f"⚠️ 生成的文档目录不存在: {self.generated_docs_path}")
             return docs
         
-        # 解析Markdown文件
-        for md_file in self.generated_docs_path.glob("*.md"):
+        ir = self._load_doc_ir()
+        if ir is not None:
+            return self._docs_from_ir(ir[1])
+        
+        # 解析Markdown文件（概览在前，其余按文件名排序，保证输出稳定）
+        md_files = sorted(self.generated_docs_path.glob("*.md"), key=lambda p: (p.name != "overview.md", p.name))
+        for md_file in md_files:
             if md_file.name == "index.md":
                 continue  # 跳过索引文件
                 
@@ -46,6 +74,127 @@ class VitePressConfigGenerator:
         
         return docs
     
+    def _load_doc_ir(self) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """读取中间表示，返回 (项目记录, 模块记录列表)，不存在或无法使用时返回None"""
+        ir_file = self.generated_docs_path / IR_FILE
+        if not ir_file.exists():
+            return None
+        
+        try:
+            return load_doc_ir(ir_file)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 读取中间表示失败，改为解析Markdown: {e}")
+            return None
+    
+    def _docs_from_ir(self, modules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """由中间表示生成路由信息（概览页面在前，模块按生成顺序排列）"""
+        docs = [{
+            "filename": "overview.md",
+            "route": "overview",
+            "title": "项目概览",
+            "sections": [],
+            "description": "项目整体概览和统计信息",
+            "package": None,
+            "package_dir": None
+        }]
+        for module in modules:
+            source = module.get("source") or ""
+            package_dir = source.rpartition("/")[0]
+            docs.append({
+                "filename": module["page"],
+                "route": module["page"][:-len(".md")],
+                "title": module["title"],
+                "sections": module.get("sections", []),
+                "description": module.get("summary") or "该模块暂无描述",
+                "package": package_dir.replace("/", "."),
+                "package_dir": package_dir
+            })
+        return docs
+    
+    def build_sidebar_groups(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """按包对模块文档分组（split 模式），返回各组的导入名、文件路径和内容
+        
+        没有包信息的文档（项目概览等）仍直接写在 config.ts 中。分组按源码目录排序，
+        组内保持文档顺序。不同目录（如 "foo bar" 与 "foo_bar"、"a/b" 与 "a.b"）
+        转换后的文件名或标题相同时，后面的分组加上由目录计算的后缀以保持唯一。
+        """
+        if self.sidebar_mode != "split":
+            return []
+        
+        packages: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in docs:
+            if doc.get("package") is not None:
+                directory = doc.get("package_dir")
+                if directory is None:
+                    directory = doc["package"]
+                packages.setdefault(directory, []).append(doc)
+        
+        # 包名相同的目录（"a/b" 与 "a.b"）标题使用目录路径
+        texts: Dict[str, int] = {}
+        for docs_in_package in packages.values():
+            package = docs_in_package[0]["package"]
+            texts[package] = texts.get(package, 0) + 1
+        
+        groups = []
+        used_files = set()
+        for index, directory in enumerate(sorted(packages)):
+            package = packages[directory][0]["package"]
+            base = re.sub(r'[^\w.-]', '_', package) or "_root"
+            file_name = base + ".json"
+            # 文件系统可能不区分大小写，按小写判断冲突
+            if file_name.lower() in used_files:
+                suffix = hashlib.sha1(directory.encode('utf-8')).hexdigest()
+                length = 8
+                file_name = f"{base}-{suffix[:length]}.json"
+                while file_name.lower() in used_files:
+                    length += 1
+                    file_name = f"{base}-{suffix[:length]}.json"
+            used_files.add(file_name.lower())
+            
+            if texts[package] > 1:
+                text = directory or "顶层模块"
+            else:
+                text = package or "顶层模块"
+            data = {
+                "text": text,
+                "collapsed": True,
+                "items": [
+                    {"text": doc["title"], "link": f"/generated/{doc['route']}"}
+                    for doc in packages[directory]
+                ]
+            }
+            groups.append({
+                "ident": f"sidebarGroup{index}",
+                "file": file_name,
+                "path": f"{self.SIDEBAR_DIR}/{file_name}",
+                "content": json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+            })
+        return groups
+    
+    def save_sidebar_groups(self, groups: List[Dict[str, Any]]) -> bool:
+        """保存侧边栏分组文件：内容未变化的分组不重写，删除已不存在的分组"""
+        sidebar_dir = self.output_dir / self.SIDEBAR_DIR
+        try:
+            written = 0
+            for group in groups:
+                if self._write_if_changed(sidebar_dir / group["file"], group["content"]):
+                    written += 1
+            
+            removed = 0
+            current = {group["file"] for group in groups}
+            if sidebar_dir.exists():
+                for stale in sidebar_dir.glob("*.json"):
+                    if stale.name not in current:
+                        stale.unlink()
+                        removed += 1
+            
+            print(f"✅ 侧边栏分组: {len(groups)} 个（写入 {written}，删除 {removed}）")
+            return True
+            
+        except Exception as e:
+            print(f"❌ 保存侧边栏分组失败: {e}")
+            return False
+    
     def _parse_markdown_file(self, file_path: Path) -> Dict[str, Any]:
         """解析单个Markdown文件"""
         doc_info = {
@@ -73,7 +222,7 @@ class VitePressConfigGenerator:
             lines = content.split('\n')
             for line in lines:
                 line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('---'):
+                if line and not line.startswith(('#', '---', '[[toc]]')):
                     doc_info["description"] = line
                     break
             
@@ -117,10 +266,15 @@ class VitePressConfigGenerator:
             }
         }
     
-    def generate_config(self, custom_config: Optional[Dict[str, Any]] = None) -> str:
+    def generate_config(self, custom_config: Optional[Dict[str, Any]] = None,
+                        docs: Optional[List[Dict[str, Any]]] = None,
+                        sidebar_groups: Optional[List[Dict[str, Any]]] = None) -> str:
         """生成VitePress配置文件内容"""
         # 解析生成的文档
-        docs = self.parse_generated_docs()
+        if docs is None:
+            docs = self.parse_generated_docs()
+        if sidebar_groups is None:
+            sidebar_groups = self.build_sidebar_groups(docs)
         
         # 合并配置
         config = self.get_default_config()
@@ -129,32 +283,46 @@ class VitePressConfigGenerator:
         
         # 渲染模板
         template = self.jinja_env.get_template('vitepress_config.j2')
-        config_content = template.render(config=config, docs=docs)
+        config_content = template.render(config=config, docs=docs, sidebar_groups=sidebar_groups)
         
         return config_content
     
+    @staticmethod
+    def _write_if_changed(file_path: Path, content: str) -> bool:
+        """内容与现有文件不同时才写入（临时文件+重命名），返回是否实际写入
+        
+        config.ts 的任何写入都会让VitePress重启开发服务器，内容相同时不能重写。
+        """
+        data = content.encode('utf-8')
+        try:
+            if file_path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        
+        atomic_write_bytes(file_path, data)
+        return True
+    
     def save_config(self, config_content: str, output_file: str = "config.ts") -> bool:
-        """保存配置文件"""
+        """保存配置文件（内容未变化时不写入）"""
         try:
-            # 确保输出目录存在
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 写入配置文件
             config_file = self.output_dir / output_file
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write(config_content)
-            
-            print(f"✅ VitePress配置已生成: {config_file}")
+            if self._write_if_changed(config_file, config_content):
+                print(f"✅ VitePress配置已生成: {config_file}")
+            else:
+                print(f"⏭️ VitePress配置未变化: {config_file}")
             return True
             
         except Exception as e:
             print(f"❌ 保存配置文件失败: {e}")
             return False
     
-    def generate_index_page(self, custom_config: Optional[Dict[str, Any]] = None) -> str:
+    def generate_index_page(self, custom_config: Optional[Dict[str, Any]] = None,
+                            docs: Optional[List[Dict[str, Any]]] = None) -> str:
         """生成首页内容"""
         # 解析生成的文档
-        docs = self.parse_generated_docs()
+        if docs is None:
+            docs = self.parse_generated_docs()
         
         # 获取统计信息
         stats = self._get_stats()
@@ -171,7 +339,7 @@ class VitePressConfigGenerator:
         return index_content
     
     def _get_stats(self) -> Optional[Dict[str, Any]]:
-        """获取统计信息"""
+        """获取统计信息（没有 stats.json 时使用中间表示中的项目统计）"""
         try:
             stats_file = self.generated_docs_path / "stats.json"
             if stats_file.exists():
@@ -179,21 +347,25 @@ class VitePressConfigGenerator:
                     return json.load(f)
         except Exception:
             pass
+        
+        ir = self._load_doc_ir()
+        if ir is not None:
+            project = ir[0]
+            return {
+                "modules": project.get("modules"),
+                "functions": project.get("functions"),
+                "classes": project.get("classes")
+            }
         return None
     
     def save_index_page(self, index_content: str, output_file: str = "index.md") -> bool:
-        """保存首页文件"""
+        """保存首页文件（内容未变化时不写入）"""
         try:
-            # 确保输出目录存在
-            index_dir = self.output_dir.parent
-            index_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 写入首页文件
-            index_file = index_dir / output_file
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(index_content)
-            
-            print(f"✅ 首页已生成: {index_file}")
+            index_file = self.output_dir.parent / output_file
+            if self._write_if_changed(index_file, index_content):
+                print(f"✅ 首页已生成: {index_file}")
+            else:
+                print(f"⏭️ 首页未变化: {index_file}")
             return True
             
         except Exception as e:
@@ -203,13 +375,21 @@ class VitePressConfigGenerator:
     def generate_and_save(self, custom_config: Optional[Dict[str, Any]] = None) -> bool:
         """生成并保存配置文件"""
         try:
+            # 文档列表只获取一次，配置和首页共用
+            docs = self.parse_generated_docs()
+            
+            # split 模式下先保存侧边栏分组（config.ts 导入这些文件）
+            sidebar_groups = self.build_sidebar_groups(docs)
+            if self.sidebar_mode == "split" and not self.save_sidebar_groups(sidebar_groups):
+                return False
+            
             # 生成VitePress配置
-            config_content = self.generate_config(custom_config)
+            config_content = self.generate_config(custom_config, docs=docs, sidebar_groups=sidebar_groups)
             if not self.save_config(config_content):
                 return False
             
             # 生成首页
-            index_content = self.generate_index_page(custom_config)
+            index_content = self.generate_index_page(custom_config, docs=docs)
             if not self.save_index_page(index_content):
                 return False
             
@@ -221,7 +401,21 @@ class VitePressConfigGenerator:
 
 def main():
     """主函数"""
-    generator = VitePressConfigGenerator()
+    parser = argparse.ArgumentParser(description="VitePress配置生成器")
+    parser.add_argument('--docs', default="../generated_docs", help='生成的文档目录')
+    parser.add_argument('--sidebar', choices=VitePressConfigGenerator.SIDEBAR_MODES,
+                        help='侧边栏模式（默认读取配置文件中的 web.sidebar，未设置时为 inline）')
+    parser.add_argument('--config', '-c', help='配置文件路径')
+    args = parser.parse_args()
+    
+    sidebar_mode = args.sidebar
+    if sidebar_mode is None and args.config:
+        import yaml
+        with open(args.config, 'r', encoding='utf-8') as f:
+            sidebar_mode = ((yaml.safe_load(f) or {}).get('web') or {}).get('sidebar')
+    
+    generator = VitePressConfigGenerator(generated_docs_path=args.docs,
+                                         sidebar_mode=sidebar_mode or "inline")
     
     # 自定义配置示例
     custom_config = {